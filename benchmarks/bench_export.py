@@ -0,0 +1,90 @@
+# Benchmark export Excel: pd.ExcelWriter + BytesIO (cara lama) vs to_excel_path (jalur job batch: workbook ditulis
+# ke file temp di disk, lalu dibaca sekali saat tombol download diklik).
+#
+#   python benchmarks/bench_export.py --sheets 60 --rows 500
+#
+# Tiap varian jalan di subprocess sendiri supaya peak RSS (ru_maxrss) tidak saling campur.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def make_sheets(n_sheets, n_rows, seed=11):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame({"NIM": [f"2201{i:06d}" for i in range(n_rows)],
+                         "Nama Mahasiswa": [f"Mahasiswa Nomor {i} {'X' * int(rng.integers(0, 20))}" for i in range(n_rows)]})
+    codes = np.array(["A", "S", "SF", "O", "OF"], dtype=object)
+    sheets = {}
+    for k in range(n_sheets):
+        df = base.copy()
+        for s in range(1, 3): df[f"Sesi {k % 14 + s}"] = codes[rng.integers(0, 5, n_rows)]
+        sheets[f"{k+1}_Matkul {k}_Pertemuan {k % 14 + 1}"] = df
+    return sheets
+
+def legacy_multi_sheet(data_dict):
+    import re
+    import pandas as pd
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        for sheet_name, df in data_dict.items():
+            safe_name = re.sub(r'[\\/*?:\[\]]', '', str(sheet_name))[:31]
+            df.to_excel(writer, index=False, sheet_name=safe_name)
+            worksheet = writer.sheets[safe_name]
+            for i, col in enumerate(df.columns):
+                width = max(df[col].astype(str).map(len).max(), len(col)) + 2
+                worksheet.set_column(i, i, width)
+    return output.getvalue()
+
+def run_variant(variant, n_sheets, n_rows):
+    sheets = make_sheets(n_sheets, n_rows)
+    rss_before = peak_rss_mb()
+    t0 = time.perf_counter()
+    if variant == "legacy":
+        size = len(legacy_multi_sheet(sheets))
+    else:
+        from fasil_engine.excel import to_excel_path
+        path = to_excel_path(sheets.items())
+        try:
+            with open(path, 'rb') as f: size = len(f.read())  # = disk_file_data di app.py
+        finally:
+            os.remove(path)
+    elapsed = time.perf_counter() - t0
+    return {"variant": variant, "sheets": n_sheets, "rows": n_rows, "seconds": round(elapsed, 3), "bytes": size,
+            "peak_rss_mb": round(peak_rss_mb(), 1), "export_rss_delta_mb": round(peak_rss_mb() - rss_before, 1)}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sheets", type=int, default=60)
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--variant", choices=["legacy", "streaming"], help="(internal) jalankan satu varian saja")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "bench_export.json"))
+    args = ap.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.sheets, args.rows)))
+        return
+
+    rows = []
+    for variant in ["legacy", "streaming"]:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--variant", variant, "--sheets", str(args.sheets), "--rows", str(args.rows)],
+                             capture_output=True, text=True, check=True)
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        print(rows[-1])
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f: json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
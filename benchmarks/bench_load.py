@@ -0,0 +1,87 @@
+# Benchmark baca export Feedback besar: cara lama (CSV sep=';' lalu ',', Excel semua kolom) vs load_feedback
+# (delimiter ditebak sekali, hanya kolom nama & sesi, Excel lewat openpyxl read-only).
+#
+#   python benchmarks/bench_load.py --rows 20000 --text-cols 8
+#
+# Tiap varian x format jalan di subprocess sendiri supaya peak RSS (ru_maxrss) tidak saling campur.
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def make_export(path, fmt, n_rows, text_cols, seed=12):
+    # Export Google Forms: timestamp, nama, sesi + banyak kolom isian bebas
+    from benchmarks.generators import make_feedback, make_roster
+    fb = make_feedback(make_roster(max(50, n_rows // 10)), n_rows)
+    rng = random.Random(seed)
+    words = ["materi", "jelas", "dosen", "baik", "zoom", "lag", "tugas", "contoh", "kurang", "mantap"]
+    for k in range(text_cols):
+        fb[f"Pertanyaan Isian {k + 1}"] = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 40))) for _ in range(n_rows)]
+    if fmt == "csv": fb.to_csv(path, index=False)  # koma: cara lama salah baca jadi 1 kolom di percobaan ';'
+    else: fb.to_excel(path, index=False)
+
+def legacy_load(f, name):
+    import pandas as pd
+    if name.endswith('.csv'):
+        try: f.seek(0); df = pd.read_csv(f, sep=';')
+        except: f.seek(0); df = pd.read_csv(f, sep=',')
+    else: df = pd.read_excel(f)
+    df.columns = [str(c).strip().title() for c in df.columns]
+    return df
+
+def run_variant(variant, path):
+    import pandas as pd  # noqa: F401 (import tidak ikut dihitung)
+    with open(path, 'rb') as f: data = f.read()
+    f = BytesIO(data); f.name = os.path.basename(path)
+    rss_before = peak_rss_mb()
+    t0 = time.perf_counter()
+    if variant == "legacy": df = legacy_load(f, f.name)
+    else:
+        from fasil_engine.excel import parse_table, FEEDBACK_COLUMNS
+        df = parse_table(f, FEEDBACK_COLUMNS)
+    elapsed = time.perf_counter() - t0
+    return {"variant": variant, "file": f.name, "seconds": round(elapsed, 3), "shape": list(df.shape),
+            "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 2), "load_rss_delta_mb": round(peak_rss_mb() - rss_before, 1)}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--text-cols", type=int, default=8)
+    ap.add_argument("--formats", default="csv,xlsx")
+    ap.add_argument("--variant", choices=["legacy", "streaming"], help="(internal) jalankan satu varian saja")
+    ap.add_argument("--path", help="(internal) file export")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "bench_load.json"))
+    args = ap.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.path)))
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats.split(","):
+            path = os.path.join(tmp, f"feedback.{fmt}")
+            make_export(path, fmt, args.rows, args.text_cols)
+            for variant in ["legacy", "streaming"]:
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), "--variant", variant, "--path", path],
+                                     capture_output=True, text=True, check=True)
+                rows.append({"rows": args.rows, "text_cols": args.text_cols, "bytes": os.path.getsize(path), **json.loads(out.stdout.strip().splitlines()[-1])})
+                print(rows[-1])
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f: json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Benchmark OCR: gambar full-resolusi (cara lama, default OCR_SETTINGS) vs pipeline preprocess_for_ocr
+# dengan downscale + grayscale (kandidat default, lihat OCR_MAX_SIDE / OCR_GRAYSCALE).
+#
+#   python benchmarks/bench_ocr.py                     -> fixture screenshot Zoom sintetis (seeded)
+#   python benchmarks/bench_ocr.py --dir foto_zoom/    -> screenshot asli
+#
+# Hasil per gambar (latency ms, nama yang dikenali, sama/tidak) ditulis ke JSON; summary.all_same harus true
+# sebelum setting ini dijadikan default.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generators import make_roster, make_screenshots  # noqa: E402
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def make_fixtures(folder, count=6, seed=7):
+    for i, img in enumerate(make_screenshots(make_roster(200, seed), count, seed)):
+        img.save(os.path.join(folder, f"zoom_{i:02d}.jpg"), quality=92)
+    return folder
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", help="folder screenshot (default: fixture sintetis)")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "bench_ocr.json"))
+    ap.add_argument("--max-side", type=int, default=1600, help="0 = tanpa downscale")
+    ap.add_argument("--no-grayscale", action="store_true")
+    ap.add_argument("--crop", action="store_true", help="crop ke panel peserta")
+    ap.add_argument("--layout", action="store_true", help="detect lalu recognize kolom nama saja")
+    args = ap.parse_args()
+
+    from fasil_engine import ocr
+    settings = dict(ocr.OCR_SETTINGS)
+    settings["max_side"] = args.max_side or None
+    settings["grayscale"] = not args.no_grayscale
+    if args.crop: settings["crop"] = ocr.OCR_CROPS["Panel Peserta (kanan)"]
+    settings["layout"] = args.layout
+
+    folder = args.dir or make_fixtures(tempfile.mkdtemp(prefix="ocr_fixtures_"))
+    reader = ocr.get_ocr_reader()
+    reader.readtext(np.zeros((64, 64), dtype=np.uint8))  # warm-up
+
+    rows = []
+    for name in sorted(os.listdir(folder)):
+        if not name.lower().endswith((".jpg", ".jpeg", ".png")): continue
+        with open(os.path.join(folder, name), "rb") as f: data = f.read()
+        t0 = time.perf_counter()
+        old = ocr.clean_ocr_result(reader.readtext(np.array(Image.open(BytesIO(data))), detail=0))
+        t1 = time.perf_counter()
+        new = ocr.ocr_image_bytes(data, reader, settings)
+        t2 = time.perf_counter()
+        old_names, new_names = old.split("\n"), new.split("\n")
+        rows.append({"image": name, "baseline_ms": round((t1 - t0) * 1000, 1), "preprocessed_ms": round((t2 - t1) * 1000, 1),
+                     "same_names": sorted(old_names) == sorted(new_names), "baseline_names": old_names, "preprocessed_names": new_names})
+        print(f"{name}: {rows[-1]['baseline_ms']} ms -> {rows[-1]['preprocessed_ms']} ms, sama={rows[-1]['same_names']}")
+
+    base = sum(r["baseline_ms"] for r in rows); prep = sum(r["preprocessed_ms"] for r in rows)
+    summary = {"images": len(rows), "baseline_ms": round(base, 1), "preprocessed_ms": round(prep, 1),
+               "speedup": round(base / prep, 2) if prep else None, "all_same": all(r["same_names"] for r in rows), "settings": settings}
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f: json.dump({"summary": summary, "rows": rows}, f, indent=2)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Benchmark cold start: waktu import modul app, run pertama app.py (AppTest), dan waktu sampai
+# hasil OCR pertama untuk OCR_STARTUP=lazy vs eager.
+#
+#   python benchmarks/bench_startup.py --think 5
+#
+# Tiap pengukuran jalan di subprocess baru (import & model benar-benar dingin). --think meniru jeda
+# user sebelum foto pertama di-upload; mode eager memakai jeda itu untuk memuat model di background.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+APP_MODULES = ["streamlit", "pandas", "fasil_engine.analysis", "fasil_engine.excel", "fasil_engine.jobs",
+               "fasil_engine.matching", "fasil_engine.ocr", "fasil_engine.parsing"]
+
+def heavy_loaded():
+    return {m: m in sys.modules for m in ["torch", "easyocr", "cv2"]}
+
+def measure_imports():
+    import importlib
+    t0 = time.perf_counter()
+    for m in APP_MODULES: importlib.import_module(m)
+    return {"seconds": round(time.perf_counter() - t0, 3), "loaded": heavy_loaded()}
+
+def measure_app_run():
+    from streamlit.testing.v1 import AppTest
+    t0 = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=300).run()
+    return {"seconds": round(time.perf_counter() - t0, 3), "exception": bool(at.exception), "loaded": heavy_loaded()}
+
+def measure_first_ocr(think):
+    from io import BytesIO
+    from benchmarks.generators import make_roster, make_screenshots
+    from fasil_engine import ocr
+    img = make_screenshots(make_roster(50), 1)[0]
+    buf = BytesIO(); img.save(buf, "JPEG", quality=90)
+    t_start = time.perf_counter()
+    if ocr.OCR_STARTUP == "eager": ocr.start_warmup()
+    time.sleep(think)
+    t0 = time.perf_counter()
+    text = ocr.extract_text_from_image(buf.getvalue())
+    return {"first_ocr_s": round(time.perf_counter() - t0, 3), "since_start_s": round(time.perf_counter() - t_start, 3),
+            "names": len([x for x in text.split("\n") if x]), "status": ocr.ocr_status()}
+
+def run_child(kind, mode, think):
+    env = {**os.environ, "OCR_STARTUP": mode}
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", kind, "--think", str(think)],
+                         capture_output=True, text=True, env=env, cwd=ROOT)
+    if out.returncode: return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"exit {out.returncode}"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--think", type=float, default=5.0, help="detik jeda sebelum foto pertama")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--child", choices=["imports", "app", "ocr"], help="(internal) satu pengukuran saja")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "bench_startup.json"))
+    args = ap.parse_args()
+
+    if args.child:
+        fn = {"imports": measure_imports, "app": measure_app_run, "ocr": lambda: measure_first_ocr(args.think)}[args.child]
+        print(json.dumps(fn()))
+        return
+
+    rows = []
+    for kind, modes in [("imports", ["lazy"]), ("app", ["off", "lazy", "eager"])]:
+        for mode in modes:
+            for i in range(args.repeat):
+                rows.append({"measure": kind, "mode": mode, "run": i, **run_child(kind, mode, args.think)}); print(rows[-1])
+    try:
+        import easyocr  # noqa: F401
+        for mode in ["lazy", "eager"]:
+            rows.append({"measure": "first_ocr", "mode": mode, **run_child("ocr", mode, args.think)}); print(rows[-1])
+    except ImportError:
+        print("easyocr tidak terpasang: pengukuran first_ocr dilewati", file=sys.stderr)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f: json.dump({"think": args.think, "rows": rows}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
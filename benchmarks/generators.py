@@ -0,0 +1,114 @@
+# Generator data sintetis (seeded, offline) untuk benchmark: roster, feedback, DB Jadwal,
+# teks batch format underscore, teks hasil OCR, dan screenshot daftar peserta Zoom.
+import random
+
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+
+FIRST = ["Budi", "Siti", "Agus", "Dewi", "Rizky", "Putri", "Andi", "Nur", "Ahmad", "Fitri", "Dian", "Eko", "Wahyu", "Ayu", "Rina",
+         "Muhammad", "Sri", "Yusuf", "Intan", "Fajar", "Nabila", "Bayu", "Citra", "Hendra", "Lestari", "Gilang", "Maya", "Reza", "Ratna", "Aditya"]
+MIDDLE = ["", "", "", "Nur", "Dwi", "Tri", "Eka", "Putra", "Ayu", "Indah", "Surya", "Adi"]
+LAST = ["Santoso", "Rahmawati", "Pratama", "Sari", "Hidayat", "Wijaya", "Saputra", "Lestari", "Kurniawan", "Nugroho", "Utami",
+        "Setiawan", "Permana", "Firmansyah", "Susanti", "Hakim", "Siregar", "Nasution", "Simanjuntak", "Wibowo", "Gunawan", "Halim"]
+MATKUL = ["Algoritma dan Pemrograman", "Basis Data", "Jaringan Komputer", "Sistem Operasi", "Kalkulus", "Statistika",
+          "Pemrograman Web", "Kecerdasan Buatan", "Etika Profesi", "Manajemen Proyek", "Analisis Data", "Struktur Data",
+          "Interaksi Manusia dan Komputer", "Rekayasa Perangkat Lunak", "Keamanan Informasi", "Pengantar Bisnis"]
+GELAR = ["Dr. ", "Ir. ", "Prof. ", "", "", ""]
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+JAM = ["07.30", "08.00", "09.40", "10.00", "13.00", "15.30", "19.00"]
+TIPE = ["Reguler", "Profesional", "International"]
+
+def person_name(rng):
+    parts = [rng.choice(FIRST), rng.choice(MIDDLE), rng.choice(LAST)]
+    return " ".join(p for p in parts if p)
+
+def make_roster(n_students, seed=1):
+    rng = random.Random(seed)
+    return pd.DataFrame({"No": range(1, n_students + 1),
+                         "Nim": [f"22{rng.randint(10, 99)}{i:06d}" for i in range(n_students)],
+                         "Nama Mahasiswa": [person_name(rng) for _ in range(n_students)]})
+
+def noisy(name, rng):
+    # Variasi yang muncul di feedback/Zoom: huruf kecil, potong, typo, nama panggilan
+    r = rng.random()
+    if r < 0.35: return name
+    if r < 0.55: return name.lower()
+    if r < 0.7: return " ".join(name.split()[:2])
+    if r < 0.85:
+        chars = list(name); i = rng.randrange(len(chars)); chars[i] = rng.choice("aiueo")
+        return "".join(chars)
+    return name.upper()
+
+def make_feedback(roster, n_rows, n_sessions=16, seed=2):
+    rng = random.Random(seed)
+    names = roster["Nama Mahasiswa"].tolist()
+    rows = []
+    for i in range(n_rows):
+        s = rng.randint(1, n_sessions)
+        sesi = rng.choice([f"Pertemuan {s}", str(s), f"{s}, {min(s + 1, n_sessions)}", f"Sesi {s}"])
+        nama = noisy(rng.choice(names), rng) if rng.random() < 0.95 else person_name(rng)
+        rows.append({"Timestamp": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)} 1{rng.randint(0, 9)}:00:00",
+                     "Nama Lengkap": nama, "Pertemuan Ke": sesi,
+                     "Saran": " ".join(rng.choice(["materi", "jelas", "dosen", "baik", "zoom", "lag", "tugas"]) for _ in range(rng.randint(3, 25)))})
+    return pd.DataFrame(rows)
+
+def make_schedule(n_rows, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        mk = rng.choice(MATKUL)
+        rows.append({"Kode Kelas": f"{''.join(w[0] for w in mk.split())[:3].upper()}{i % 900 + 1:03d}",
+                     "Mata Kuliah": mk, "Nama Dosen": rng.choice(GELAR) + person_name(rng),
+                     "Jam": f"{rng.choice(JAM)} - {rng.randint(9, 21)}.00", "Hari": rng.choice(DAYS)})
+    return pd.DataFrame(rows)
+
+def make_batch_text(schedule, n_classes, seed=4):
+    # Format yang dibaca parse_random_batch_text: "<Fasil> <Hari> <tgl> <Matkul>_Pertemuan n_<tgl>_<Tipe>_<Dosen>_<jam>"
+    rng = random.Random(seed)
+    recs = schedule.to_dict("records")
+    entries = []
+    for _ in range(n_classes):
+        r = rng.choice(recs)
+        tgl = f"{rng.randint(1, 28)} {rng.choice(MONTHS)} 2024"
+        s = rng.randint(1, 15)
+        sesi = rng.choice([f"Pertemuan {s}", f"Pertemuan {s} & {s + 1}"])
+        tipe = f"_{rng.choice(TIPE)}" if rng.random() < 0.7 else ""
+        jam = r["Jam"].split(" - ")[0]
+        fasil = rng.choice(FIRST)
+        entries.append(f"{fasil} {rng.choice(DAYS)} {tgl} {r['Mata Kuliah']}_{sesi}_{tgl}{tipe}_{r['Nama Dosen']}_{jam}")
+    return rng.choice(["\n", " ", "\n\n"]).join(entries)
+
+def make_zoom_text(roster, n_present, seed=5):
+    # Teks seperti keluaran OCR: nomor urut, nama variasi, baris host/fasil
+    rng = random.Random(seed)
+    names = rng.sample(roster["Nama Mahasiswa"].tolist(), min(n_present, len(roster)))
+    lines = ["Fasil Kelas (Host)"] + [f"{i + 1}. {noisy(n, rng)}" if rng.random() < 0.3 else noisy(n, rng) for i, n in enumerate(names)]
+    return "\n".join(lines)
+
+def load_font(size):
+    try: return ImageFont.load_default(size=size)
+    except TypeError: return ImageFont.load_default()
+
+def render_zoom_screenshot(names, size=(4032, 3024)):
+    # Jendela meeting gelap + panel Participants putih di kanan, seperti foto layar dari HP
+    W, H = size
+    img = Image.new("RGB", size, (24, 24, 27))
+    d = ImageDraw.Draw(img)
+    font = load_font(max(12, H // 45))
+    panel_x = int(W * 0.72)
+    d.rectangle([panel_x, 0, W, H], fill=(250, 250, 250))
+    d.text((panel_x + 30, 30), f"Participants ({len(names)})", fill=(0, 0, 0), font=font)
+    step = H // 28
+    for i, name in enumerate(names):
+        y = 40 + (i + 2) * step
+        d.text((panel_x + 30, y), name, fill=(20, 20, 20), font=font)
+        d.text((W - 160, y), "Mute", fill=(90, 90, 90), font=font)
+    for i, label in enumerate(["Unmute", "Stop Video", "Share Screen", "Chat", "Record"]):
+        d.text((60 + i * panel_x // 5, H - 80), label, fill=(200, 200, 200), font=font)
+    return img
+
+def make_screenshots(roster, count, seed=6, size=(4032, 3024)):
+    rng = random.Random(seed)
+    names = roster["Nama Mahasiswa"].tolist()
+    return [render_zoom_screenshot(rng.sample(names, min(len(names), rng.randint(8, 20))), size) for _ in range(count)]
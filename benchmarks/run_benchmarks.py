@@ -0,0 +1,139 @@
+# Benchmark semua tahap pipeline di beberapa ukuran data (offline, seeded).
+#
+#   python benchmarks/run_benchmarks.py                         -> tier small + medium
+#   python benchmarks/run_benchmarks.py --tiers small,medium,large --out hasil.json
+#   python benchmarks/run_benchmarks.py --compare baseline.json  -> exit 1 kalau ada tahap yang lebih lambat dari toleransi
+#
+# Hasil JSON: {"meta": {...}, "results": [{"tier", "stage", "calls", "seconds", "per_call_ms", ...}]}
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generators import make_batch_text, make_feedback, make_roster, make_schedule, make_screenshots, make_zoom_text  # noqa: E402
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# nama tier -> (jumlah kelas, jumlah mahasiswa)
+TIERS = {"small": (10, 50), "medium": (100, 500), "large": (1000, 5000)}
+
+def bench_tier(tier, n_classes, n_students, seed=1, max_sheets=50, legacy_queries=200, ocr_images=0):
+    import pandas as pd
+    from fasil_engine.analysis import FeedbackIndex, generate_output_excel, generate_presensi_real, presensi_matrix, presensi_roster, presensi_sheets, run_analysis
+    from fasil_engine.excel import to_excel_download, to_excel_multi_sheet
+    from fasil_engine.matching import RosterIndex, ScheduleIndex, clean_nama_zoom, enrich_with_db, get_best_match_info
+    from fasil_engine.parsing import parse_random_batch_text
+
+    results = []
+    def record(stage, calls, seconds, **extra):
+        results.append({"tier": tier, "classes": n_classes, "students": n_students, "stage": stage, "calls": calls,
+                        "seconds": round(seconds, 4), "per_call_ms": round(seconds / calls * 1000, 3) if calls else None, **extra})
+        print(f"  {stage:<32} {calls:>6} x  {seconds:8.3f} s", file=sys.stderr)
+
+    roster = make_roster(n_students, seed)
+    schedule = make_schedule(max(3 * n_classes, 30), seed + 1)
+    feedback = make_feedback(roster, 4 * n_students, seed=seed + 2)
+    text = make_batch_text(schedule, n_classes, seed + 3)
+    names = roster["Nama Mahasiswa"].astype(str).tolist()
+
+    t = time.perf_counter(); parsed = parse_random_batch_text(text)
+    record("parse_random_batch_text", 1, time.perf_counter() - t, rows=len(parsed), chars=len(text))
+
+    t = time.perf_counter(); sched_index = ScheduleIndex(schedule)
+    record("ScheduleIndex.build", 1, time.perf_counter() - t, schedule_rows=len(schedule))
+    t = time.perf_counter(); enriched = enrich_with_db(parsed.copy(), sched_index)
+    record("enrich_with_db", len(parsed), time.perf_counter() - t, filled=int((enriched["Kode Kelas"] != "N/A").sum()))
+
+    zoom_texts = [make_zoom_text(roster, min(40, n_students), seed + 10 + i) for i in range(len(parsed))]
+    queries = [clean_nama_zoom(x) for z in zoom_texts for x in z.split("\n") if len(x) > 3]
+    t = time.perf_counter()
+    for q in queries[:legacy_queries]: get_best_match_info(q, names)
+    record("get_best_match_info", min(legacy_queries, len(queries)), time.perf_counter() - t)
+    t = time.perf_counter(); index = RosterIndex(names)
+    record("RosterIndex.build", 1, time.perf_counter() - t)
+    t = time.perf_counter()
+    for q in queries: index.match(q)
+    record("RosterIndex.match", len(queries), time.perf_counter() - t, cache_hits=index.hits, cache_misses=index.misses)
+
+    t = time.perf_counter(); fb_index = FeedbackIndex(feedback, index)
+    record("FeedbackIndex.build", 1, time.perf_counter() - t, feedback_rows=len(feedback))
+    infos = [{"tgl": r["Tanggal"], "matkul": r["Mata Kuliah"], "dosen": r["Nama Dosen"], "kode": r["Kode Kelas"], "jam_full": r["Jam"],
+              "pertemuan": str(r["Sesi"]), "tipe": r["Tipe"], "tipe_belajar": "Online", "req_zoom": r["Req Zoom"]} for r in enriched.to_dict("records")]
+    analysed = []
+    t = time.perf_counter()
+    for info, z in zip(infos, zoom_texts): analysed.append(run_analysis(info, z, "", index, fb_index))
+    record("run_analysis", len(infos), time.perf_counter() - t)
+
+    base = presensi_roster(roster); base_names = base["Nama Mahasiswa"].astype(str)
+    t = time.perf_counter()
+    matrices = {f"{i+1}_{info['matkul'][:15]}_{info['pertemuan']}": presensi_matrix(base_names, hz, ho, fb, info)
+                for i, (info, (_, hz, ho, fb)) in enumerate(zip(infos, analysed))}
+    record("presensi_matrix", len(matrices), time.perf_counter() - t)
+    sample = list(zip(infos, analysed))[:max_sheets]
+    t = time.perf_counter()
+    for info, (_, hz, ho, fb) in sample: generate_presensi_real(roster, hz, ho, fb, info)
+    record("generate_presensi_real", len(sample), time.perf_counter() - t)
+
+    laporan = pd.concat([generate_output_excel(info, stats, "foto.jpg", 3, "Fasilitator Kelas") for info, (stats, *_) in zip(infos, analysed)])
+    t = time.perf_counter(); size = len(to_excel_download(laporan))
+    record("to_excel_download", 1, time.perf_counter() - t, rows=len(laporan), bytes=size)
+    subset = dict(list(matrices.items())[:max_sheets])
+    t = time.perf_counter(); size = len(to_excel_multi_sheet(presensi_sheets(subset, base)))
+    record("to_excel_multi_sheet", len(subset), time.perf_counter() - t, rows_per_sheet=len(base), bytes=size)
+
+    if ocr_images:
+        from fasil_engine.ocr import OcrCache, extract_texts_parallel
+        import fasil_engine.ocr as ocr
+        imgs = {}
+        for i, img in enumerate(make_screenshots(roster, ocr_images, seed + 4)):
+            buf = BytesIO(); img.save(buf, "JPEG", quality=90); imgs[f"{i}.jpg"] = buf.getvalue()
+        ocr._cache = OcrCache()  # cache kosong supaya yang diukur OCR sungguhan
+        ocr.get_ocr_reader()
+        t = time.perf_counter(); extract_texts_parallel(imgs, workers=os.cpu_count() or 1)
+        record("extract_texts_parallel", len(imgs), time.perf_counter() - t)
+    return results
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f: baseline = json.load(f)
+    base = {(r["tier"], r["stage"]): r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        b = base.get((r["tier"], r["stage"]))
+        if b and b["seconds"] >= 0.05 and r["seconds"] > b["seconds"] * tolerance:
+            slower.append(f"{r['tier']}/{r['stage']}: {b['seconds']:.3f}s -> {r['seconds']:.3f}s")
+    return slower
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tiers", default="small,medium", help=f"daftar tier dipisah koma: {', '.join(TIERS)}")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--max-sheets", type=int, default=50, help="batas sheet presensi untuk tahap Excel/DataFrame")
+    ap.add_argument("--ocr-images", type=int, default=0, help="ukur OCR juga (butuh easyocr) untuk N screenshot")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "benchmarks.json"))
+    ap.add_argument("--compare", help="JSON hasil sebelumnya sebagai baseline")
+    ap.add_argument("--tolerance", type=float, default=1.25, help="rasio lambat yang dianggap regresi")
+    args = ap.parse_args()
+
+    results = []
+    for tier in args.tiers.split(","):
+        n_classes, n_students = TIERS[tier.strip()]
+        print(f"[{tier}] {n_classes} kelas, {n_students} mahasiswa", file=sys.stderr)
+        results += bench_tier(tier.strip(), n_classes, n_students, args.seed, args.max_sheets, ocr_images=args.ocr_images)
+
+    import pandas as pd
+    meta = {"python": platform.python_version(), "pandas": pd.__version__, "platform": platform.platform(),
+            "cpus": os.cpu_count(), "seed": args.seed, "tiers": args.tiers, "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f: json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(args.out)
+
+    if args.compare:
+        slower = compare(results, args.compare, args.tolerance)
+        for s in slower: print(f"REGRESI {s}", file=sys.stderr)
+        if slower: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
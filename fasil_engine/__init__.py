@@ -0,0 +1,23 @@
+# Engine laporan kelas tanpa Streamlit. Submodule di-import saat atributnya dipakai,
+# jadi `import fasil_engine` tetap ringan (pandas/easyocr tidak ikut ter-load).
+import importlib
+
+_EXPORTS = {
+    "analysis": ["FeedbackIndex", "roster_names", "run_analysis", "generate_presensi_real", "PresensiMatrix", "presensi_sheets", "generate_output_excel", "generate_gaji"],
+    "batch": ["batch_cell", "run_batch", "run_batch_sharded"],
+    "excel": ["load_table", "get_table_cache", "load_data_smart", "load_feedback", "write_excel", "to_excel_file", "to_excel_path", "to_excel_download", "to_excel_multi_sheet"],
+    "jobs": ["Job", "JobRunner", "get_job_runner", "run_batch_job"],
+    "matching": ["clean_nama_zoom", "get_best_match_info", "RosterIndex", "normalize_jam", "ScheduleIndex", "SchedulePicker", "enrich_with_db"],
+    "ocr": ["OCR_SETTINGS", "OCR_CROPS", "OcrCache", "ocr_slots", "get_ocr_reader", "get_ocr_cache", "preprocess_for_ocr",
+            "select_name_rows", "ocr_layout", "extract_text_from_image", "extract_texts_parallel"],
+    "parsing": ["get_session_list", "clean_matkul_smart", "parse_data_template", "iter_batch_rows", "parse_random_batch_text"],
+    "photos": ["ZipPhotos", "photo_key", "align_photos", "write_photo_zip", "to_photo_zip_path"],
+    "report": ["RunReport"],
+    "store": ["DataStore", "get_store"],
+}
+_LOOKUP = {name: mod for mod, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_LOOKUP)
+
+def __getattr__(name):
+    if name not in _LOOKUP: raise AttributeError(f"module 'fasil_engine' has no attribute '{name}'")
+    return getattr(importlib.import_module(f".{_LOOKUP[name]}", __name__), name)
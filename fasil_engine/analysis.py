@@ -0,0 +1,136 @@
+import re
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from .matching import RosterIndex, clean_nama_zoom
+from .parsing import get_session_list
+
+# --- STATS & EXCEL ---
+def roster_names(db):
+    return db[next((c for c in db.columns if 'nama' in c.lower()), db.columns[1])].astype(str).tolist()
+
+class FeedbackIndex:
+    # Sheet feedback diparse & dicocokkan ke master sekali per batch: sesi -> baris valid, baris -> nama master
+    def __init__(self, df_fb, roster):
+        self.names = []; self.by_sesi = defaultdict(list); self.cache = {}
+        self.col_fb = self.col_sesi = None
+        if df_fb is None: return
+        self.col_fb = next((c for c in df_fb.columns if 'nama' in str(c).lower()), None)
+        self.col_sesi = next((c for c in df_fb.columns if 'pertemuan' in str(c).lower() or 'sesi' in str(c).lower()), None)
+        if not self.col_fb: return
+        for i, (_, r) in enumerate(df_fb.iterrows()):
+            if self.col_sesi:
+                for v in set(re.findall(r'\d+', str(r[self.col_sesi]))): self.by_sesi[v].append(i)
+            self.names.append(roster.match(str(r[self.col_fb]))[0])
+
+    def rows_for(self, pertemuan):
+        # Index baris feedback (urut) yang sesinya beririsan dengan sesi kelas
+        if not self.col_sesi: return range(len(self.names))
+        targets = tuple(str(s) for s in get_session_list(pertemuan))
+        if targets not in self.cache:
+            self.cache[targets] = sorted(set().union(*(self.by_sesi.get(t, ()) for t in targets)))
+        return self.cache[targets]
+
+    def lookup(self, pertemuan, total_hadir):
+        final_fb = set(); ghosts = []
+        if not self.col_fb: return final_fb, ghosts
+        for i in self.rows_for(pertemuan):
+            m = self.names[i]
+            if m:
+                final_fb.add(m)
+                if m not in total_hadir: ghosts.append(m)
+        return final_fb, ghosts
+
+def run_analysis(info, txt_zoom, txt_onsite, db_names, df_fb, match_counter=None):
+    # 1. Matching
+    roster = db_names if isinstance(db_names, RosterIndex) else RosterIndex(db_names)
+    list_zoom = [clean_nama_zoom(x) for x in str(txt_zoom).split('\n') if len(x)>3]
+    hadir_zoom = set()
+    for z in list_zoom:
+        best, _ = roster.match(z, match_counter)
+        if best: hadir_zoom.add(best)
+
+    list_onsite = [clean_nama_zoom(x) for x in str(txt_onsite).split('\n') if len(x)>3]
+    hadir_onsite = set()
+    for z in list_onsite:
+        best, _ = roster.match(z, match_counter)
+        if best: hadir_onsite.add(best)
+    
+    total_hadir = hadir_zoom.union(hadir_onsite)
+
+    # 2. Feedback
+    fb_index = df_fb if isinstance(df_fb, FeedbackIndex) else FeedbackIndex(df_fb, roster)
+    final_fb, ghosts = fb_index.lookup(info['pertemuan'], total_hadir)
+    
+    fb_ok = 0; fb_no = []
+    for h in total_hadir:
+        if h in final_fb: fb_ok += 1
+        else: fb_no.append(h)
+    
+    stats = {'total': len(roster), 'hadir_valid': len(total_hadir), 'online_count': len(hadir_zoom), 
+             'onsite_count': len(hadir_onsite), 'fb_ok': fb_ok, 'fb_no': len(fb_no), 
+             'pct': round(fb_ok/len(total_hadir)*100,1) if total_hadir else 0, 'ghosts': ghosts, 'fb_no_list': fb_no}
+    
+    return stats, hadir_zoom, hadir_onsite, final_fb
+
+# --- PRESENSI ---
+PRESENSI_CODES = np.array(["A", "S", "SF", "O", "OF"], dtype=object)  # int8 -> kode (A = Default Alpha)
+
+def presensi_roster(db):
+    col_nm = next((c for c in db.columns if 'nama' in str(c).lower()), db.columns[1])
+    col_nim = next((c for c in db.columns if 'nim' in str(c).lower()), db.columns[0])
+    df_out = db[[col_nim, col_nm]].copy()
+    df_out.columns = ['NIM', 'Nama Mahasiswa']
+    return df_out
+
+def presensi_codes(names, hadir_zoom, hadir_onsite, list_feedback):
+    # names: Series nama (str). Onsite menang atas zoom, sama seperti urutan if/elif lama.
+    onsite = names.isin(hadir_onsite).to_numpy()
+    zoom = names.isin(hadir_zoom).to_numpy() & ~onsite
+    fb = names.isin(list_feedback).to_numpy()
+    codes = np.zeros(len(names), dtype=np.int8)
+    codes[onsite] = np.where(fb[onsite], 1, 2)
+    codes[zoom] = np.where(fb[zoom], 3, 4)
+    return codes
+
+class PresensiMatrix:
+    # Presensi satu kelas: matriks int8 mahasiswa x sesi (view dari satu vektor kode), jadi sheet saat export
+    def __init__(self, codes, sessions):
+        self.sessions = sessions; self.student_codes = codes
+        self.codes = np.broadcast_to(codes[:, None], (len(codes), len(sessions)))
+
+    def __reduce__(self):
+        # Di-pickle sebagai vektor kode saja (RowCache, antar proses), bukan matriks hasil broadcast
+        return PresensiMatrix, (self.student_codes, self.sessions)
+
+    def to_frame(self, base):
+        df_out = base.copy()
+        if len(df_out):
+            for j, s in enumerate(self.sessions): df_out[f"Sesi {s}"] = PRESENSI_CODES[self.codes[:, j]]
+        return df_out
+
+def presensi_matrix(names, hadir_zoom, hadir_onsite, list_feedback, info):
+    sessions = list(dict.fromkeys(s for s in get_session_list(info['pertemuan']) if 1 <= int(s) <= 16))
+    return PresensiMatrix(presensi_codes(names, hadir_zoom, hadir_onsite, list_feedback), sessions)
+
+def generate_presensi_real(db, hadir_zoom, hadir_onsite, list_feedback, info):
+    base = presensi_roster(db)
+    return presensi_matrix(base['Nama Mahasiswa'].astype(str), hadir_zoom, hadir_onsite, list_feedback, info).to_frame(base)
+
+def presensi_sheets(presensi, base):
+    # Sheet dibuat satu per satu saat ditulis, bukan disimpan semua di memori
+    for sheet_id, m in presensi.items(): yield sheet_id, m.to_frame(base)
+
+def generate_output_excel(info, stats, filename, sks, role):
+    summary = f"Kelas : {info['kode']}\nJam : {info['jam_full']}\nTotal: {stats['total']}\nHadir: {stats['hadir_valid']}\nFeedback: {stats['fb_ok']}"
+    return pd.DataFrame({
+        "Tanggal": [info['tgl']], "Dosen": [info['dosen']], "Matkul": [info['matkul']], 
+        "Jam": [info['jam_full']], "Lokasi": [info['tipe_belajar']], "SKS": [sks], 
+        "Tipe": [info['tipe']], "Sesi": [info['pertemuan']], 
+        "Req Zoom": [info.get('req_zoom', '-')], "Bukti": [filename],
+        "Hadir": [stats['hadir_valid']], "Feedback %": [f"{stats['pct']}%"], "Summary": [summary]
+    })
+
+def generate_gaji(info, fee, filename):
+    jml = len(get_session_list(info['pertemuan'])) or 1
+    return pd.DataFrame([{"Tanggal": info['tgl'], "Dosen": info['dosen'], "Matkul": info['matkul'], "Sesi": info['pertemuan'], "Fee": fee, "Total": fee*jml}])
@@ -0,0 +1,170 @@
+import json
+import os
+import pickle
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from .analysis import FeedbackIndex, roster_names, run_analysis, generate_output_excel, generate_gaji, presensi_roster, presensi_matrix
+from .cache import ContentCache, content_key
+from .matching import RosterIndex
+from .ocr import OCR_SETTINGS, extract_texts_parallel, read_image_bytes
+from .photos import align_photos
+from .report import RunReport
+
+ROW_CACHE_VERSION = 1  # naikkan kalau isi entri RowCache (hasil _process_row, PresensiMatrix, metrik) berubah
+
+class RowCache(ContentCache):
+    # Hasil per baris batch per sidik jari input (nilai baris, hash foto, hash master & feedback, setting).
+    # Disk (pickle, BATCH_CACHE_DIR) jadi checkpoint: batch yang terputus lanjut dari baris yang belum selesai.
+    suffix = ".pkl"
+
+    def __init__(self, max_entries=4096, disk_dir=None, disk_max_bytes=256 * 1024 * 1024):
+        super().__init__(max_entries, disk_dir, disk_max_bytes)
+
+    def _read_disk(self, path):
+        with open(path, 'rb') as f: return pickle.load(f)
+
+    def _write_disk(self, path, value):
+        with open(path, 'wb') as f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+_row_cache = None
+_row_lock = threading.Lock()
+
+def get_row_cache():
+    global _row_cache
+    with _row_lock:
+        if _row_cache is None: _row_cache = RowCache(disk_dir=os.environ.get("BATCH_CACHE_DIR") or None)
+        return _row_cache
+
+# FeedbackIndex terakhir per (hash feedback, hash master): rerun setelah edit satu baris tidak scan ulang feedback
+_fb_indexes = ContentCache(max_entries=4)
+
+def frame_key(df):
+    # Sidik jari isi DataFrame (Master/Feedback); None -> ""
+    if df is None: return ""
+    try: data = pd.util.hash_pandas_object(df, index=False).values.tobytes()
+    except TypeError: data = df.to_csv(index=False).encode()
+    return content_key(data, *df.columns)
+
+def batch_cell(df_proc, row, k, d=''):
+    return str(row.get(next((c for c in df_proc.columns if k.lower() in c.lower()), None), d))
+
+def run_batch(df_proc, db, df_fb=None, images=None, roster=None, fb_index=None, tipe_belajar="Online", rem_h1="13.00", rem_h30="07.30",
+              sks=3, fee=150000, role="Fasilitator Kelas", ocr_workers=4, ocr_settings=None, ocr_batched=False,
+              on_ocr_progress=None, on_progress=None, report=None, profile=False, use_cache=True, cancel=None):
+    # images: {nama_file: bytes/path/file/ZipMember} atau ZipPhotos; dicocokkan ke kolom Nama File Foto lewat
+    # align_photos(). Hasil: laporan & gaji (list DataFrame 1 baris),
+    # presensi {sheet: PresensiMatrix} + presensi_base (NIM, Nama) -> lihat presensi_sheets(),
+    # photos {Nama File Foto: sumber} (untuk write_photo_zip), missing_photos [Nama File Foto tanpa foto],
+    # report: RunReport (waktu per tahap & per baris; profile=True -> cProfile loop batch).
+    # use_cache: baris yang inputnya tidak berubah diambil dari RowCache (tanpa OCR/matching ulang).
+    # roster / fb_index: index yang sudah jadi (mis. dari DataStore), dipakai apa adanya kalau diberikan.
+    # cancel: threading.Event (job dibatalkan) -> foto yang belum di-OCR dilewati.
+    images = images or {}
+    report = report if report is not None else RunReport(profile=profile)
+    row_cache = get_row_cache() if use_cache else None
+    ocr_settings = ocr_settings or OCR_SETTINGS
+    base = presensi_roster(db)
+    base_names = base['Nama Mahasiswa'].astype(str)
+    report.meta.update(rows=len(df_proc), feedback_rows=0 if df_fb is None else len(df_fb))
+
+    # Sidik jari per baris. Foto tidak disimpan di memori: member ZIP pakai CRC+ukuran dari direktori ZIP,
+    # sumber lain di-hash lalu isinya dibuang; OCR nanti membaca ulang hanya foto yang perlu.
+    rows = list(df_proc.iterrows())
+    with report.stage("fingerprint", rows=len(rows)):
+        row_imgs = [batch_cell(df_proc, row, 'foto', batch_cell(df_proc, row, 'file')) for _, row in rows]
+        images, missing = align_photos(row_imgs, images)
+        img_keys = {t: getattr(src, "content_id", None) or content_key(read_image_bytes(src)) for t, src in images.items()}
+        db_key, fb_key = frame_key(db), frame_key(df_fb)
+        run_key = (ROW_CACHE_VERSION, db_key, fb_key, json.dumps(ocr_settings, sort_keys=True), tipe_belajar, rem_h1, rem_h30, sks, fee, role, *df_proc.columns)
+        row_keys = [content_key(img_keys.get(t, "").encode(), idx, *run_key, *row.tolist()) for (idx, row), t in zip(rows, row_imgs)]
+        cached = [row_cache.get(k) if row_cache else None for k in row_keys]
+    todo = [i for i, c in enumerate(cached) if c is None]
+    report.count("row_cache_hits", len(rows) - len(todo)); report.count("row_cache_misses", len(todo))
+    report.count("photos_matched", len(images)); report.count("photos_missing", len(missing))
+
+    if todo:
+        with report.stage("index roster & feedback"):
+            roster = roster if roster is not None else RosterIndex(roster_names(db))
+            fb_index = fb_index if fb_index is not None else _fb_indexes.get(content_key(fb_key.encode(), db_key))
+            if fb_index is None:
+                fb_index = FeedbackIndex(df_fb, roster); _fb_indexes.put(content_key(fb_key.encode(), db_key), fb_index)
+        report.meta.update(roster=len(roster))
+
+    # Tahap OCR: foto unik dari baris yang belum ada di cache diproses dulu secara paralel
+    needed = {t: images[t] for t in dict.fromkeys(row_imgs[i] for i in todo) if t in images}
+    ocr_timings = {}
+    with report.stage("ocr", max(1, len(needed))):
+        ocr_texts = extract_texts_parallel(needed, ocr_workers, on_ocr_progress, settings=ocr_settings, batched=ocr_batched, timings=ocr_timings,
+                                           cancel=cancel)
+    for _, source in ocr_timings.values(): report.count(f"ocr_{source}")
+
+    res = []; res_gaji = []; batch_presensi = {}
+    with report.profiling():
+        for n, ((idx, row), t_img, key, hit) in enumerate(zip(rows, row_imgs, row_keys, cached), 1):
+            if hit is None:
+                hit = _process_row(df_proc, idx, row, t_img, ocr_texts, ocr_timings, roster, fb_index, base_names, report,
+                                   tipe_belajar, rem_h1, rem_h30, sks, fee, role)
+                # OCR gagal/dibatalkan -> hasil (0 hadir) tidak disimpan, run berikutnya mencoba OCR lagi
+                if row_cache and ocr_timings.get(t_img, (0.0, "none"))[1] not in ("error", "cancelled"): row_cache.put(key, hit)
+                report.row(**hit["metrics"])
+            else: report.row(**{**hit["metrics"], "ocr_source": "row-cache", "cached": True})
+            res.append(hit["laporan"]); res_gaji.append(hit["gaji"]); batch_presensi[hit["sheet"]] = hit["presensi"]
+
+            if on_progress: on_progress(n, len(df_proc))
+    report.count("rows_laporan", len(res))
+    return {"laporan": res, "gaji": res_gaji, "presensi": batch_presensi, "presensi_base": base, "photos": images,
+            "missing_photos": missing, "report": report.finish()}
+
+def _process_row(df_proc, idx, row, t_img, ocr_texts, ocr_timings, roster, fb_index, base_names, report,
+                 tipe_belajar, rem_h1, rem_h30, sks, fee, role):
+    def g(k, d=''): return batch_cell(df_proc, row, k, d)
+
+    info = {"tgl":g('tanggal'), "matkul":g('mata'), "dosen":g('dosen'), "kode":g('kode','N/A'), "jam_full":g('jam'),
+            "pertemuan":g('sesi'), "tipe":g('tipe'), "tipe_belajar":tipe_belajar, "rem_h1":rem_h1, "rem_h30":rem_h30, "req_zoom": g('req zoom')}
+    txt_zoom = ocr_texts.get(t_img, "")
+
+    match_counter = Counter()  # hit/miss matching baris ini saja (roster bisa dipakai job lain bersamaan)
+    t0 = time.perf_counter()
+    stats, h_zoom, h_onsite, f_fb = run_analysis(info, txt_zoom, "", roster, fb_index, match_counter)
+    t1 = time.perf_counter()
+    laporan = generate_output_excel(info, stats, t_img, sks, role)
+    gaji = generate_gaji(info, fee, t_img)
+    t2 = time.perf_counter()
+    sheet_id = f"{idx+1}_{info['matkul'][:15]}_{info['pertemuan']}"
+    presensi = presensi_matrix(base_names, h_zoom, h_onsite, f_fb, info)
+    t3 = time.perf_counter()
+
+    report.add("run_analysis", t1 - t0); report.add("laporan & gaji", t2 - t1); report.add("presensi", t3 - t2)
+    match_hits = match_counter["hits"]; match_calls = match_hits + match_counter["misses"]
+    report.count("match_calls", match_calls); report.count("match_cache_hits", match_hits)
+    ocr_ms, ocr_source = ocr_timings.get(t_img, (0.0, "none"))
+    metrics = dict(row=idx+1, sheet=sheet_id, foto=t_img, ocr_source=ocr_source, ocr_ms=round(ocr_ms, 1),
+                   analysis_ms=round((t1 - t0) * 1000, 2), output_ms=round((t2 - t1) * 1000, 2), presensi_ms=round((t3 - t2) * 1000, 2),
+                   match_calls=match_calls, match_cache_hits=match_hits, hadir_zoom=len(h_zoom), feedback=len(f_fb), cached=False)
+    return {"laporan": laporan, "gaji": gaji, "sheet": sheet_id, "presensi": presensi, "stats": stats,
+            "hadir": (h_zoom, h_onsite, f_fb), "metrics": metrics}
+
+def run_batch_sharded(df_proc, db, workers=2, **kwargs):
+    # Baris dibagi jadi potongan berurutan, tiap potongan jalan di proses sendiri (OCR reader per proses)
+    workers = max(1, min(int(workers), len(df_proc)))
+    if workers == 1: return run_batch(df_proc, db, **kwargs)
+    # Foto dicocokkan sekali di sini (fuzzy 1-1 lintas semua baris); shard cukup cocok persis
+    row_imgs = [batch_cell(df_proc, row, 'foto', batch_cell(df_proc, row, 'file')) for _, row in df_proc.iterrows()]
+    kwargs["images"], missing = align_photos(row_imgs, kwargs.get("images") or {})
+    bounds = np.array_split(np.arange(len(df_proc)), workers)
+    merged = {"laporan": [], "gaji": [], "presensi": {}, "photos": {}, "report": RunReport()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_batch, df_proc.iloc[b[0]:b[-1]+1], db, **kwargs) for b in bounds if len(b)]
+        for fut in futures:
+            part = fut.result()
+            merged["laporan"] += part["laporan"]; merged["gaji"] += part["gaji"]; merged["presensi"].update(part["presensi"])
+            merged["photos"].update(part["photos"])
+            merged["presensi_base"] = part["presensi_base"]; merged["report"].merge(part["report"])
+    merged["missing_photos"] = missing
+    merged["report"].meta.update(rows=len(df_proc), shards=len(futures))
+    merged["report"].finish()
+    return merged
@@ -0,0 +1,76 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+def content_key(data, *parts):
+    # sha256 dari bagian-bagian (setting, nama, dll.) + isi file
+    h = hashlib.sha256()
+    for p in parts: h.update(str(p).encode()); h.update(b"\0")
+    h.update(data)
+    return h.hexdigest()
+
+class ContentCache:
+    # Cache berbasis hash isi: LRU di memori, opsional di disk (file <key><suffix>, dibatasi total ukuran).
+    suffix = ".bin"
+
+    def __init__(self, max_entries=128, disk_dir=None, disk_max_bytes=64 * 1024 * 1024):
+        self.mem = OrderedDict(); self.max_entries = max_entries
+        self.disk_dir = disk_dir; self.disk_max_bytes = disk_max_bytes
+        if disk_dir: os.makedirs(disk_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.hits = 0; self.disk_hits = 0; self.misses = 0
+
+    # Subclass mengganti ini untuk format disk-nya
+    def _read_disk(self, path): raise NotImplementedError
+    def _write_disk(self, path, value): raise NotImplementedError
+    def _out(self, value): return value
+
+    def _path(self, key): return os.path.join(self.disk_dir, f"{key}{self.suffix}")
+
+    def get(self, key):
+        with self.lock:
+            if key in self.mem:
+                self.mem.move_to_end(key); self.hits += 1
+                return self._out(self.mem[key])
+        if self.disk_dir and os.path.exists(self._path(key)):
+            try:
+                value = self._read_disk(self._path(key))
+                os.utime(self._path(key))
+                self._remember(key, value)
+                with self.lock: self.hits += 1; self.disk_hits += 1
+                return self._out(value)
+            except Exception: pass
+        with self.lock: self.misses += 1
+        return None
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.mem[key] = value; self.mem.move_to_end(key)
+            while len(self.mem) > self.max_entries: self.mem.popitem(last=False)
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if not self.disk_dir: return
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            self._write_disk(tmp, value)
+            os.replace(tmp, self._path(key))
+            self._evict_disk()
+        except Exception:
+            if os.path.exists(tmp): os.remove(tmp)
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(self.suffix): continue
+            st_ = os.stat(os.path.join(self.disk_dir, name))
+            entries.append((st_.st_mtime, st_.st_size, name))
+        total = sum(e[1] for e in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes: break
+            try: os.remove(os.path.join(self.disk_dir, name)); total -= size
+            except OSError: pass
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self.mem)}
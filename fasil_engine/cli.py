@@ -0,0 +1,146 @@
+import argparse
+import os
+import sys
+import time
+
+IMG_EXT = ('.jpg', '.jpeg', '.png')
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="python -m fasil_engine", description="Batch laporan kelas tanpa UI Streamlit.")
+    ap.add_argument("batch", help="Excel/CSV batch (format template) atau .txt hasil paste jadwal")
+    ap.add_argument("--master", help="Master Mhs (xlsx/csv); boleh kosong kalau sudah ada di --store")
+    ap.add_argument("--feedback", help="Feedback (xlsx/csv)")
+    ap.add_argument("--photos", help="folder atau .zip foto bukti (dicocokkan ke kolom Nama File Foto)")
+    ap.add_argument("--photo-zip", help="tulis ZIP foto bukti yang di-rename sesuai Nama File Foto")
+    ap.add_argument("--db-jadwal", help="DB Jadwal untuk auto-fill Kode Kelas (input .txt)")
+    ap.add_argument("--store", default=os.environ.get("FASIL_STORE"), help="file SQLite DataStore (default: env FASIL_STORE)")
+    ap.add_argument("--kelas", default="", help="kelas di --store: file yang diberikan di-import, yang tidak diambil dari store")
+    ap.add_argument("--semester", default="", help="semester di --store")
+    ap.add_argument("--out", default=".", help="folder output (default: folder aktif)")
+    ap.add_argument("--workers", type=int, default=1, help="jumlah proses, baris batch dibagi rata")
+    ap.add_argument("--ocr-workers", type=int, default=min(4, os.cpu_count() or 1), help="thread OCR per proses")
+    ap.add_argument("--ocr-batched", action="store_true", help="pakai readtext_batched easyocr")
+    ap.add_argument("--crop", action="store_true", help="OCR hanya panel peserta (kanan)")
+    ap.add_argument("--layout", action="store_true", help="OCR dua tahap: deteksi kotak, baca kolom nama saja")
+    ap.add_argument("--no-ocr", action="store_true", help="lewati OCR (easyocr/torch tidak di-load)")
+    ap.add_argument("--lokasi", default="Online", choices=["Online", "Onsite", "Hybrid"])
+    ap.add_argument("--rem-h1", default="13.00")
+    ap.add_argument("--rem-h30", default="07.30")
+    ap.add_argument("--sks", type=int, default=3)
+    ap.add_argument("--fee", type=int, default=150000)
+    ap.add_argument("--role", default="Fasilitator Kelas")
+    ap.add_argument("--no-cache", action="store_true", help="hitung ulang semua baris (abaikan RowCache / BATCH_CACHE_DIR)")
+    ap.add_argument("--report", help="tulis rincian waktu per tahap/baris ke .json atau .csv")
+    ap.add_argument("--profile", help="tulis profil cProfile loop batch ke file .prof (hanya --workers 1)")
+    return ap
+
+def load_path(path, kind=None):
+    from .excel import load_data_smart, load_feedback
+    with open(path, 'rb') as f: df = (load_feedback if kind == "feedback" else load_data_smart)(f)
+    if df is None: raise SystemExit(f"Gagal membaca {path}")
+    return df
+
+def build_store_parser():
+    ap = argparse.ArgumentParser(prog="python -m fasil_engine store", description="Kelola DataStore SQLite (Master, Feedback, DB Jadwal).")
+    ap.add_argument("--store", default=os.environ.get("FASIL_STORE"), help="file SQLite (default: env FASIL_STORE)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="import file (isi sama -> dilewati) dan bangun index matching")
+    imp.add_argument("kind", choices=["master", "feedback", "jadwal"])
+    imp.add_argument("path")
+    imp.add_argument("--kelas", default="")
+    imp.add_argument("--semester", default="")
+    sub.add_parser("list", help="daftar data tersimpan")
+    rm = sub.add_parser("delete", help="hapus data (id dari list)")
+    rm.add_argument("id", type=int)
+    return ap
+
+def store_main(argv):
+    ap = build_store_parser(); args = ap.parse_args(argv)
+    if not args.store: ap.error("--store atau FASIL_STORE wajib")
+    from .store import DataStore
+    store = DataStore(args.store)
+    if args.cmd == "import":
+        t = time.perf_counter()
+        ds = store.import_frame(args.kind, load_path(args.path, args.kind), args.kelas, args.semester, os.path.basename(args.path))
+        print(f"{args.kind} #{ds} ({args.kelas or '-'} / {args.semester or '-'}) siap, {time.perf_counter() - t:.1f} s")
+    elif args.cmd == "delete": store.delete(args.id)
+    else: print(store.datasets().to_string(index=False))
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["store"]: return store_main(argv[1:])
+    ap = build_parser(); args = ap.parse_args(argv)
+    if args.profile and args.workers > 1: ap.error("--profile hanya bisa dengan --workers 1")
+    t0 = time.perf_counter()
+    import pandas as pd
+    from .analysis import presensi_sheets
+    from .batch import batch_cell, run_batch, run_batch_sharded
+    from .excel import write_excel
+    from .matching import enrich_with_db
+    from .ocr import OCR_SETTINGS, OCR_CROPS, start_warmup
+    from .parsing import parse_random_batch_text
+    from .photos import ZipPhotos, align_photos, write_photo_zip
+    from .store import DataStore
+
+    if args.photos and not args.no_ocr and args.workers == 1:
+        start_warmup()  # model OCR dimuat paralel dengan baca Excel/parse batch
+    store = DataStore(args.store) if args.store else None
+
+    def dataset(kind, path):
+        # -> (DataFrame, id di store). Dengan store: file di-import (isi sama -> no-op), tanpa file diambil dari store
+        if store is None: return (load_path(path, kind) if path else None), None
+        if path: ds = store.import_frame(kind, load_path(path, kind), args.kelas, args.semester, os.path.basename(path))
+        else: ds = store.find(kind, args.kelas, args.semester)
+        return (store.frame(ds), ds) if ds is not None else (None, None)
+
+    if args.batch.lower().endswith('.txt'):
+        with open(args.batch, encoding='utf-8') as f: df_proc = parse_random_batch_text(f)
+        jadwal, jadwal_id = dataset("jadwal", args.db_jadwal)
+        if jadwal is not None: df_proc = enrich_with_db(df_proc, store.schedule_index(jadwal_id) if jadwal_id else jadwal)
+    else: df_proc = load_path(args.batch)
+    if df_proc is None or df_proc.empty: raise SystemExit("Batch kosong.")
+
+    db, master_id = dataset("master", args.master)
+    if db is None: ap.error("--master wajib (atau import dulu ke --store untuk --kelas/--semester ini)")
+    df_fb, fb_id = dataset("feedback", args.feedback)
+    images = {}
+    if args.photos and (args.photo_zip or not args.no_ocr):
+        if args.photos.lower().endswith('.zip'): images = ZipPhotos(args.photos)
+        else: images = {n: os.path.join(args.photos, n) for n in sorted(os.listdir(args.photos)) if n.lower().endswith(IMG_EXT)}
+    ocr_images = {} if args.no_ocr else images
+
+    settings = {**OCR_SETTINGS, "crop": OCR_CROPS["Panel Peserta (kanan)"] if args.crop else None,
+                "layout": args.layout}
+    kwargs = dict(df_fb=df_fb, images=ocr_images, roster=store.roster_index(master_id) if master_id else None,
+                  fb_index=store.feedback_index(fb_id, master_id) if fb_id else None, tipe_belajar=args.lokasi, rem_h1=args.rem_h1, rem_h30=args.rem_h30,
+                  sks=args.sks, fee=args.fee, role=args.role, ocr_workers=args.ocr_workers, ocr_settings=settings, ocr_batched=args.ocr_batched,
+                  use_cache=not args.no_cache)
+    if args.workers > 1: result = run_batch_sharded(df_proc, db, workers=args.workers, **kwargs)
+    else: result = run_batch(df_proc, db, on_progress=lambda n, total: print(f"\r{n}/{total}", end="", file=sys.stderr),
+                             profile=bool(args.profile), **kwargs)
+    report = result["report"]
+    print(file=sys.stderr)
+
+    os.makedirs(args.out, exist_ok=True)
+    outputs = {"Batch_Laporan.xlsx": ("excel_laporan", [("Sheet1", pd.concat(result["laporan"]))]),
+               "Batch_Gaji.xlsx": ("excel_gaji", [("Sheet1", pd.concat(result["gaji"]))]),
+               "Batch_Presensi.xlsx": ("excel_presensi", presensi_sheets(result["presensi"], result["presensi_base"]))}
+    for name, (stage, sheets) in outputs.items():
+        print(write_excel(sheets, os.path.join(args.out, name), report=report, stage=stage))
+    if args.photo_zip:
+        with report.stage("photo_zip"):
+            photos, missing = align_photos([batch_cell(df_proc, row, 'foto', batch_cell(df_proc, row, 'file')) for _, row in df_proc.iterrows()], images)
+            write_photo_zip(photos.items(), args.photo_zip)
+        print(args.photo_zip)
+        if missing: print(f"{len(missing)} Nama File Foto tanpa foto: " + ", ".join(missing[:5]) + (" ..." if len(missing) > 5 else ""), file=sys.stderr)
+    report.finish()
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8', newline='') as f:
+            f.write(report.to_csv() if args.report.lower().endswith('.csv') else report.to_json())
+    if args.profile:
+        with open(args.profile, 'wb') as f: f.write(report.profile_bytes())
+    print(report.breakdown().to_string(index=False), file=sys.stderr)
+    print(f"Selesai: {len(df_proc)} baris, {len(images)} foto, {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
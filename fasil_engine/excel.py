@@ -0,0 +1,214 @@
+import csv
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+import numpy as np
+import pandas as pd
+from .cache import ContentCache, content_key
+
+# --- LOAD (cache per hash isi file) ---
+# Kolom yang dipakai dari export Feedback (FeedbackIndex / run_analysis): nama & sesi
+FEEDBACK_COLUMNS = ('nama', 'pertemuan', 'sesi')
+SNIFF_BYTES = 64 * 1024
+
+def sniff_delimiter(sample):
+    # Delimiter CSV dari potongan awal file; kalau Sniffer ragu, pilih yang paling sering di baris header
+    text = sample.decode('utf-8', errors='ignore') if isinstance(sample, bytes) else sample
+    try: return csv.Sniffer().sniff(text, delimiters=';,\t|').delimiter
+    except csv.Error:
+        header = text.split('\n', 1)[0]
+        return max(';,\t|', key=header.count) if any(d in header for d in ';,\t|') else ','
+
+def column_filter(keywords):
+    # usecols: kolom yang namanya (lower) memuat salah satu kata kunci; None -> semua kolom
+    if not keywords: return None
+    return lambda c: any(k in str(c).strip().lower() for k in keywords)
+
+def compact_dtypes(df):
+    # Kolom teks yang banyak berulang (sesi, nama) -> category
+    for c in df.columns:
+        text = df[c].dtype == object or (pd.api.types.is_string_dtype(df[c].dtype) and not isinstance(df[c].dtype, pd.CategoricalDtype))
+        if text and len(df) and df[c].nunique(dropna=True) <= len(df) // 2: df[c] = df[c].astype('category')
+    return df
+
+# Sama dengan na_values bawaan pandas (pandas._libs.parsers.STR_NA_VALUES)
+NA_STRINGS = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                        'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+def excel_cell(v):
+    if isinstance(v, float) and v.is_integer(): return int(v)
+    if isinstance(v, str) and v in NA_STRINGS: return None
+    return v
+
+def read_excel_columns(buf, keep):
+    # openpyxl read-only: baris dibaca streaming, hanya sel kolom terpilih yang disimpan. Hasil sama dengan
+    # pd.read_excel(usecols=...) untuk sheet pertama (header kembar "X.1", sel kosong/NA -> NaN, float bulat -> int).
+    import openpyxl
+    wb = openpyxl.load_workbook(buf, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        names = []; seen = {}
+        for i, v in enumerate(next(rows, ())):
+            name = f"Unnamed: {i}" if excel_cell(v) is None else str(excel_cell(v))
+            k = seen.get(name, 0); seen[name] = k + 1
+            names.append(f"{name}.{k}" if k else name)
+        idx = [i for i, c in enumerate(names) if keep(c)]
+        data = [[] for _ in idx]; n = last = 0
+        for row in rows:
+            n += 1
+            for out, i in zip(data, idx): out.append(excel_cell(row[i]) if i < len(row) else None)
+            if any(v is not None for v in row): last = n  # baris kosong di akhir sheet dibuang, seperti pandas
+    finally: wb.close()
+    df = pd.DataFrame({names[i]: col[:last] for i, col in zip(idx, data)}).infer_objects()
+    return df.where(df.notna(), np.nan) if len(df) else df
+
+def parse_table(uploaded_file, usecols=None):
+    # usecols: kata kunci nama kolom (mis. FEEDBACK_COLUMNS) -> hanya kolom itu yang dibaca, dtype dipadatkan.
+    # CSV: delimiter ditebak dari awal file lalu dibaca sekali; Excel dengan usecols: openpyxl read-only.
+    keep = column_filter(usecols)
+    try:
+        if uploaded_file.name.lower().endswith('.csv'):
+            uploaded_file.seek(0); sep = sniff_delimiter(uploaded_file.read(SNIFF_BYTES))
+            uploaded_file.seek(0); df = pd.read_csv(uploaded_file, sep=sep, usecols=keep, low_memory=False)
+        elif keep is not None: df = read_excel_columns(uploaded_file, keep)
+        else: df = pd.read_excel(uploaded_file)
+        df.columns = [str(c).strip().title() for c in df.columns]
+        return compact_dtypes(df) if keep is not None else df
+    except: return None
+
+class TableCache(ContentCache):
+    # Tabel hasil parse per hash isi file. Sidecar Parquet di disk kalau pyarrow ada.
+    suffix = ".parquet"
+
+    def __init__(self, max_entries=16, disk_dir=None, disk_max_bytes=256 * 1024 * 1024):
+        if disk_dir:
+            try: import pyarrow  # noqa: F401
+            except ImportError: disk_dir = None
+        super().__init__(max_entries, disk_dir, disk_max_bytes)
+
+    def key(self, data, name, usecols=None):
+        # "sniff": entri lama dari loader ';'-lalu-',' (CSV koma terbaca 1 kolom) tidak dipakai lagi
+        return content_key(data, os.path.splitext(str(name))[1].lower(), "sniff", *(usecols or ()))
+
+    def _read_disk(self, path):
+        return pd.read_parquet(path)
+
+    def _write_disk(self, path, value):
+        value.to_parquet(path, index=False)
+
+    def _out(self, value):
+        # Salinan, supaya perubahan di pemanggil (Label_UI, enrich) tidak mengotori cache
+        return value.copy()
+
+_table_cache = None
+_table_lock = threading.Lock()
+
+def get_table_cache():
+    # TABLE_CACHE_DIR (env) mengaktifkan sidecar Parquet, dibagi antar sesi & restart
+    global _table_cache
+    with _table_lock:
+        if _table_cache is None: _table_cache = TableCache(disk_dir=os.environ.get("TABLE_CACHE_DIR") or None)
+        return _table_cache
+
+def load_table(uploaded_file, usecols=None):
+    # -> DataFrame; None kalau gagal dibaca. Kolom nama/sesi/jam dicari oleh pemakainya (roster_names,
+    # FeedbackIndex, ScheduleIndex, ...) dengan aturannya masing-masing.
+    try:
+        uploaded_file.seek(0); data = uploaded_file.read()
+    except: return None
+    cache = get_table_cache()
+    key = cache.key(data, uploaded_file.name, usecols)
+    hit = cache.get(key)
+    if hit is not None: return hit
+    buf = BytesIO(data); buf.name = uploaded_file.name
+    df = parse_table(buf, usecols)
+    if df is None: return None
+    cache.put(key, df)
+    return df.copy()
+
+def load_data_smart(uploaded_file):
+    return load_table(uploaded_file)
+
+def load_feedback(uploaded_file):
+    # Export Feedback (Google Forms) bisa puluhan ribu baris dengan banyak kolom isian bebas: cukup nama & sesi
+    return load_table(uploaded_file, FEEDBACK_COLUMNS)
+
+# --- EXPORT (xlsxwriter constant_memory, baris ditulis satu per satu) ---
+WIDTH_SAMPLE = 2000
+
+def column_widths(df, sample=WIDTH_SAMPLE):
+    # Lebar kolom dari sampel baris (awal + tersebar rata), bukan salinan string seluruh kolom
+    n = len(df)
+    if n > sample:
+        rows = np.unique(np.concatenate([np.arange(sample // 2), np.linspace(0, n - 1, sample // 2).astype(np.int64)]))
+        df = df.iloc[rows]
+    widths = []
+    for col in df.columns:
+        longest = df[col].astype(str).map(len).max() if len(df) else 0
+        widths.append(max(longest, len(str(col))) + 2)
+    return widths
+
+def _cell(v):
+    if v is None or v is pd.NaT or v is pd.NA or (isinstance(v, float) and v != v): return None
+    if isinstance(v, pd.Timestamp): return v.to_pydatetime()
+    return v
+
+def safe_sheet_name(sheet_name, used):
+    name = re.sub(r'[\\/*?:\[\]]', '', str(sheet_name))[:31] or "Sheet"
+    base, k = name, 1
+    while name.lower() in used:
+        k += 1; name = f"{base[:31 - len(str(k)) - 1]}~{k}"
+    used.add(name.lower())
+    return name
+
+def write_excel(sheets, dest, report=None, stage="excel"):
+    # sheets: iterable (nama, DataFrame), dipakai satu per satu. dest: path atau file biner.
+    # report (RunReport, opsional): waktu tulis dicatat di tahap `stage`, plus jumlah sheet & baris.
+    import xlsxwriter
+    t0 = time.perf_counter(); n_sheets = n_rows = 0
+    workbook = xlsxwriter.Workbook(dest, {'constant_memory': True, 'nan_inf_to_errors': True, 'remove_timezone': True,
+                                          'default_date_format': 'yyyy-mm-dd hh:mm:ss'})
+    used = set()
+    for sheet_name, df in sheets:
+        worksheet = workbook.add_worksheet(safe_sheet_name(sheet_name, used))
+        for i, width in enumerate(column_widths(df)): worksheet.set_column(i, i, width)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns])
+        for r, row in enumerate(df.itertuples(index=False, name=None), 1):
+            worksheet.write_row(r, 0, [_cell(v) for v in row])
+        n_sheets += 1; n_rows += len(df)
+    workbook.close()
+    if report is not None:
+        report.add(stage, time.perf_counter() - t0, n_sheets)
+        report.count(f"{stage}_sheets", n_sheets); report.count(f"{stage}_rows", n_rows)
+    return dest
+
+def to_excel_file(sheets, **kwargs):
+    # Workbook di-spool ke file temp di disk (bukan RAM); dikembalikan dalam posisi awal
+    tmp = tempfile.TemporaryFile()
+    write_excel(sheets, tmp, **kwargs)
+    tmp.seek(0)
+    return tmp
+
+def to_excel_path(sheets, **kwargs):
+    # Workbook ditulis ke file .xlsx temp di disk (pemanggil yang menghapus) -> path. Dipakai job batch:
+    # hasilnya tetap di disk selama job ada di riwayat dan baru dibaca saat tombol download diklik.
+    fd, path = tempfile.mkstemp(prefix="fasil_", suffix=".xlsx")
+    try:
+        with os.fdopen(fd, 'wb') as f: write_excel(sheets, f, **kwargs)
+    except BaseException:
+        os.remove(path); raise
+    return path
+
+def _read_all(tmp):
+    with tmp: return tmp.read()
+
+def to_excel_download(df, **kwargs):
+    return _read_all(to_excel_file([('Sheet1', df)], **kwargs))
+
+def to_excel_multi_sheet(data_dict, **kwargs):
+    # data_dict: dict {sheet: DataFrame} atau iterable (sheet, DataFrame), mis. presensi_sheets()
+    items = data_dict.items() if hasattr(data_dict, 'items') else data_dict
+    return _read_all(to_excel_file(items, **kwargs))
@@ -0,0 +1,130 @@
+# Antrian job batch di dalam proses server. Job jalan di thread pool terbatas (BATCH_MAX_JOBS),
+# status/progres bisa di-poll dari sesi mana pun lewat id job, hasil (file Excel) disimpan sampai
+# terdorong keluar dari riwayat. OCR tetap dibatasi global oleh ocr.ocr_slots.
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, label=""):
+        self.id = uuid.uuid4().hex[:12]; self.label = label
+        self.status = "queued"  # queued -> running -> done / error / cancelled
+        self.progress = {}      # tahap -> (selesai, total, keterangan)
+        self.result = None; self.error = None; self.traceback = None
+        self.created = time.time(); self.started = self.finished = None
+        self.cancel_event = threading.Event(); self.future = None
+        self.temp_files = []  # file hasil di disk, dihapus saat job keluar dari riwayat
+
+    def update(self, stage, done, total, note=""):
+        # Dipanggil dari thread job; sekaligus titik berhenti kalau job dibatalkan
+        if self.cancel_event.is_set(): raise JobCancelled()
+        self.progress[stage] = (done, total, note)
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel(): self.status = "cancelled"; self.finished = time.time()
+
+    def discard(self):
+        for path in self.temp_files:
+            try: os.remove(path)
+            except OSError: pass
+        self.temp_files = []
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def elapsed(self):
+        if self.started is None: return 0.0
+        return (self.finished or time.time()) - self.started
+
+class JobRunner:
+    def __init__(self, max_workers=2, keep=16):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-job")
+        self.max_workers = max_workers; self.keep = keep
+        self.jobs = OrderedDict(); self.lock = threading.Lock()
+
+    def submit(self, fn, *args, label="", **kwargs):
+        # fn(job, *args, **kwargs); nilai kembaliannya jadi job.result
+        job = Job(label)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._trim()
+        job.future = self.pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_event.is_set(): job.status = "cancelled"; return
+        job.status = "running"; job.started = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs); job.status = "done"
+        except JobCancelled: job.status = "cancelled"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"; job.traceback = traceback.format_exc(); job.status = "error"
+        finally: job.finished = time.time()
+
+    def _trim(self):
+        # Job selesai paling lama dibuang duluan; job yang masih aktif tidak pernah dibuang
+        done = [jid for jid, j in self.jobs.items() if not j.active]
+        for jid in done[:max(0, len(self.jobs) - self.keep)]: self.jobs.pop(jid).discard()
+
+    def get(self, job_id):
+        with self.lock: return self.jobs.get(job_id)
+
+    def position(self, job):
+        # Jumlah job antri di depan job ini (0 = berikutnya jalan)
+        with self.lock: queued = [j for j in self.jobs.values() if j.status == "queued"]
+        return queued.index(job) if job in queued else 0
+
+    def stats(self):
+        with self.lock: jobs = list(self.jobs.values())
+        return {"running": sum(j.status == "running" for j in jobs), "queued": sum(j.status == "queued" for j in jobs),
+                "workers": self.max_workers}
+
+_runner = None
+_runner_lock = threading.Lock()
+
+def get_job_runner():
+    # BATCH_MAX_JOBS (env): jumlah batch yang jalan bersamaan, sisanya antri
+    global _runner
+    with _runner_lock:
+        if _runner is None: _runner = JobRunner(max(1, int(os.environ.get("BATCH_MAX_JOBS") or 2)))
+        return _runner
+
+def run_batch_job(job, df_proc, db, df_fb=None, images=None, **kwargs):
+    # Batch + export Excel di thread job; hasilnya file siap download + RunReport.
+    # Workbook dan ZIP foto (sudah di-rename) ditulis ke file temp di sini; hasil job hanya menyimpan path-nya,
+    # jadi workbook, foto & ZIP upload tidak ikut tertahan di memori selama job ada di riwayat.
+    import pandas as pd
+    from .analysis import presensi_sheets
+    from .batch import run_batch
+    from .excel import to_excel_path
+    from .photos import to_photo_zip_path
+    result = run_batch(df_proc, db, df_fb, images,
+                       on_ocr_progress=lambda d, n, name: job.update("ocr", d, n, name),
+                       on_progress=lambda n, total: job.update("baris", n, total), cancel=job.cancel_event, **kwargs)
+    report = result["report"]
+    workbooks = [("Batch_Laporan.xlsx", "excel_laporan", lambda: [("Sheet1", pd.concat(result["laporan"]))]),
+                 ("Batch_Gaji.xlsx", "excel_gaji", lambda: [("Sheet1", pd.concat(result["gaji"]))]),
+                 ("Batch_Presensi.xlsx", "excel_presensi", lambda: presensi_sheets(result["presensi"], result["presensi_base"]))]
+    files = {}  # nama file -> path di disk
+    for i, (name, stage, sheets) in enumerate(workbooks):
+        job.update("excel", i, len(workbooks), name)
+        files[name] = to_excel_path(sheets(), report=report, stage=stage)
+        job.temp_files.append(files[name])
+    job.update("excel", 3, 3)
+    photo_zip = None; n_photos = 0
+    if result["photos"]:
+        job.update("foto", 0, 1, "Foto_Bukti.zip")
+        with report.stage("photo_zip"): photo_zip, n_photos = to_photo_zip_path(result["photos"].items())
+        job.temp_files.append(photo_zip)
+        job.update("foto", 1, 1)
+    return {"files": files, "report": report.finish(), "rows": len(result["laporan"]), "photo_zip": photo_zip, "photo_count": n_photos,
+            "missing_photos": result["missing_photos"]}
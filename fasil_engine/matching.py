@@ -0,0 +1,283 @@
+import re
+import bisect
+import difflib
+import heapq
+from collections import defaultdict
+import numpy as np
+
+def clean_nama_zoom(nama_raw):
+    if not isinstance(nama_raw, str): return ""
+    if any(x in nama_raw.lower() for x in ["fasil", "host", "admin"]): return "IGNORE"
+    nama = re.sub(r'^[\d\-\_\.]+\s*', '', nama_raw) 
+    nama = re.sub(r'[\-\_]\s*[A-Z]{2,3}$', '', nama) 
+    return nama.strip().title()
+
+def get_best_match_info(nama_zoom, list_db_names):
+    nama_zoom = nama_zoom.lower()
+    db_lower_map = {name.lower(): name for name in list_db_names}
+    for db_low, db_real in db_lower_map.items():
+        if nama_zoom in db_low or db_low in nama_zoom:
+            conflicts = [db_lower_map[k] for k in db_lower_map if nama_zoom in k]
+            return db_real, (conflicts if len(conflicts)>1 else [])
+    matches = difflib.get_close_matches(nama_zoom, list_db_names, n=3, cutoff=0.6)
+    if matches: return matches[0], (matches if len(matches)>1 else [])
+    return None, []
+
+# --- MATCHING INDEX (ROSTER) ---
+def char_profile(strings):
+    # Matriks jumlah karakter per string -> batas atas quick_ratio difflib secara vektor
+    vocab = {}
+    for s in strings:
+        for ch in s: vocab.setdefault(ch, len(vocab))
+    counts = np.zeros((len(strings), max(len(vocab), 1)), dtype=np.int32)
+    for i, s in enumerate(strings):
+        for ch in s: counts[i, vocab[ch]] += 1
+    lens = np.array([len(s) for s in strings], dtype=np.int64)
+    return vocab, counts, lens
+
+def quick_ratio_bound(profile, text):
+    vocab, counts, lens = profile
+    vec = np.zeros(counts.shape[1], dtype=np.int32)
+    for ch in text:
+        j = vocab.get(ch)
+        if j is not None: vec[j] += 1
+    inter = np.minimum(counts, vec).sum(axis=1)
+    total = lens + len(text)
+    # Dua string kosong: SequenceMatcher('', '').ratio() == 1.0
+    return np.where(total == 0, 1.0, 2.0 * inter / np.maximum(total, 1))
+
+class RosterIndex:
+    # Index nama master, dibangun sekali per upload. Hasil identik dengan get_best_match_info.
+    def __init__(self, list_db_names, cache_size=50000):
+        self.names = [str(n) for n in list_db_names]
+        self.lower_map = {name.lower(): name for name in self.names}
+        self.keys = list(self.lower_map)
+        self.pos = {k: i for i, k in enumerate(self.keys)}
+        self.key_lens = sorted({len(k) for k in self.keys})
+        self.trigrams = defaultdict(set)
+        for i, k in enumerate(self.keys):
+            for j in range(len(k) - 2): self.trigrams[k[j:j+3]].add(i)
+        self.profile = char_profile(self.names)
+        self.cache = {}; self.cache_size = cache_size
+        self.hits = 0; self.misses = 0
+
+    def __len__(self): return len(self.names)
+
+    def _containing(self, q):
+        # key yang memuat q (nama_zoom in db_low)
+        if len(q) < 3: return [i for i, k in enumerate(self.keys) if q in k]
+        postings = [self.trigrams.get(q[j:j+3]) for j in range(len(q) - 2)]
+        if not all(postings): return []
+        ids = set.intersection(*sorted(postings, key=len))
+        return sorted(i for i in ids if q in self.keys[i])
+
+    def _contained(self, q):
+        # key yang termuat di q (db_low in nama_zoom)
+        hits = []
+        for n in self.key_lens:
+            if n > len(q): break
+            for j in range(len(q) - n + 1):
+                i = self.pos.get(q[j:j+n])
+                if i is not None: hits.append(i)
+        return hits
+
+    def _close_matches(self, q, n=3, cutoff=0.6):
+        # Sama dengan difflib.get_close_matches. Kandidat dicek urut batas quick_ratio (tertinggi dulu);
+        # berhenti begitu batasnya di bawah skor ke-n, karena ratio <= quick_ratio.
+        if not self.names: return []
+        bound = quick_ratio_bound(self.profile, q)
+        s = difflib.SequenceMatcher(); s.set_seq2(q)
+        top = []
+        for i in np.argsort(-bound, kind='stable'):
+            b = bound[i]
+            if b < cutoff - 1e-9 or (len(top) == n and b < top[0][0]): break
+            x = self.names[i]; s.set_seq1(x)
+            if s.real_quick_ratio() >= cutoff and s.quick_ratio() >= cutoff and s.ratio() >= cutoff:
+                item = (s.ratio(), x)
+                if len(top) < n: heapq.heappush(top, item)
+                elif item > top[0]: heapq.heapreplace(top, item)
+        return [x for _, x in sorted(top, reverse=True)]
+
+    def _resolve(self, q):
+        containing = self._containing(q)
+        first = min(containing + self._contained(q), default=None)
+        if first is not None:
+            conflicts = [self.lower_map[self.keys[i]] for i in containing]
+            return self.lower_map[self.keys[first]], (conflicts if len(conflicts)>1 else [])
+        matches = self._close_matches(q)
+        if matches: return matches[0], (matches if len(matches)>1 else [])
+        return None, []
+
+    def match(self, nama_zoom, counter=None):
+        # counter: Counter milik pemanggil (hits/misses). self.hits/misses = total semua pemanggil index ini.
+        q = nama_zoom.lower()
+        hit = self.cache.get(q)
+        if hit is not None:
+            self.hits += 1
+            if counter is not None: counter["hits"] += 1
+            return hit[0], list(hit[1])
+        self.misses += 1
+        if counter is not None: counter["misses"] += 1
+        best, conflicts = self._resolve(q)
+        if len(self.cache) >= self.cache_size: self.cache.clear()
+        self.cache[q] = (best, conflicts)
+        return best, list(conflicts)
+
+
+# --- ENRICHMENT LOGIC (AUTO FILL KODE KELAS) ---
+def normalize_jam(text):
+    match = re.search(r'(\d{1,2})[:.](\d{2})', str(text))
+    if match: return f"{int(match.group(1)):02d}:{match.group(2)}"
+    return ""
+
+SCHEDULE_KEYS = {
+    'mtk': ['mata', 'matkul', 'course', 'subject', 'mk'],
+    'dos': ['dosen', 'pengajar', 'lecturer', 'instructor', 'nama dosen'],
+    'jam': ['jam', 'waktu', 'time', 'pukul', 'schedule'],
+    'kod': ['kode', 'code', 'class id', 'kd'],
+}
+
+class ScheduleIndex:
+    # Index DB Jadwal: string sudah di-lower/normalisasi sekali, diblok per jam,
+    # kandidat disaring dengan batas atas skor sebelum SequenceMatcher dijalankan.
+    def __init__(self, df_db):
+        cols = {k: next((c for c in df_db.columns if any(w in c.lower() for w in keys)), None) for k, keys in SCHEDULE_KEYS.items()}
+        self.col_mtk, self.col_dos, self.col_jam, self.col_kod = cols['mtk'], cols['dos'], cols['jam'], cols['kod']
+        self.ok = bool(self.col_mtk and self.col_kod)
+        self.cache = {}
+        if not self.ok: return
+        records = df_db.to_dict('records')
+        self.kode = [r[self.col_kod] for r in records]
+        mtk = [str(r.get(self.col_mtk, '')).lower().strip() for r in records]
+        dos = [str(r.get(self.col_dos, '')).lower().strip() if self.col_dos else "" for r in records]
+        self.jam = np.array([normalize_jam(r.get(self.col_jam, '')) if self.col_jam else "" for r in records], dtype=object)
+        # String unik saja yang di-skor; record menunjuk ke id-nya
+        self.mtk_vals, self.mtk_id = self._factorize(mtk)
+        self.dos_vals, self.dos_id = self._factorize(dos)
+        self.mtk_profile = char_profile(self.mtk_vals)
+        self.dos_profile = char_profile(self.dos_vals)
+        self.by_jam = defaultdict(list)
+        for i, j in enumerate(self.jam):
+            if j: self.by_jam[j].append(i)
+
+    @staticmethod
+    def _factorize(values):
+        uniq = {}
+        ids = np.array([uniq.setdefault(v, len(uniq)) for v in values], dtype=np.int64)
+        return list(uniq), ids
+
+    def _combine(self, s_mtk, s_dos, s_jam):
+        if self.col_dos and self.col_jam: return (s_mtk * 0.4) + (s_dos * 0.3) + (s_jam * 0.3)
+        elif self.col_dos: return (s_mtk * 0.6) + (s_dos * 0.4)
+        return s_mtk
+
+    def lookup(self, mata_kuliah, nama_dosen, jam):
+        tgt_mtk = str(mata_kuliah).lower().strip()
+        tgt_dos = str(nama_dosen).lower().strip()
+        tgt_jam = normalize_jam(jam)
+        key = (tgt_mtk, tgt_dos, tgt_jam)
+        if key not in self.cache:
+            if len(self.cache) >= 10000: self.cache.clear()
+            self.cache[key] = self._best(*key)
+        return self.cache[key]
+
+    def _best(self, tgt_mtk, tgt_dos, tgt_jam):
+        if not self.kode: return "N/A"
+        # Batas atas per record: quick_ratio >= ratio, dosen 1.0 kalau substring
+        ub_mtk = quick_ratio_bound(self.mtk_profile, tgt_mtk)
+        ub_dos = np.zeros(len(self.dos_vals))
+        if self.col_dos:
+            ub_dos = quick_ratio_bound(self.dos_profile, tgt_dos)
+            for i, d in enumerate(self.dos_vals):
+                if tgt_dos in d or d in tgt_dos: ub_dos[i] = 1.0
+        ub_jam = np.zeros(len(self.kode))
+        if self.col_jam and tgt_jam: ub_jam[self.by_jam.get(tgt_jam, [])] = 1.0
+        ub = self._combine(ub_mtk[self.mtk_id], ub_dos[self.dos_id], ub_jam)
+        cand = np.flatnonzero(ub > 0.65 - 1e-9)
+        if not len(cand): return "N/A"
+
+        sm_mtk = {}; sm_dos = {}
+        best_score = 0; best_kode = "N/A"
+        for i in cand:
+            m = self.mtk_id[i]; d = self.dos_id[i]
+            if m not in sm_mtk: sm_mtk[m] = difflib.SequenceMatcher(None, tgt_mtk, self.mtk_vals[m]).ratio()
+            score_dos = 0
+            if self.col_dos:
+                if d not in sm_dos:
+                    db_dos = self.dos_vals[d]
+                    sm_dos[d] = 1.0 if tgt_dos in db_dos or db_dos in tgt_dos else difflib.SequenceMatcher(None, tgt_dos, db_dos).ratio()
+                score_dos = sm_dos[d]
+            score_jam = 1.0 if self.col_jam and tgt_jam and self.jam[i] and tgt_jam == self.jam[i] else 0.0
+            final_score = self._combine(sm_mtk[m], score_dos, score_jam)
+            if final_score > best_score and final_score > 0.65: # Threshold 65%
+                best_score = final_score
+                best_kode = self.kode[i]
+        return best_kode
+
+class SchedulePicker:
+    # Pilihan kelas dari DB Jadwal: label "Matkul - Dosen [Jam]" + index token dibangun sekali per DB,
+    # pencarian prefix per kata (semua kata harus cocok) -> hanya hasil teratas yang dikirim ke widget.
+    TOKEN = re.compile(r'\w+')
+
+    def __init__(self, df_db):
+        self.col_mtk = next((c for c in df_db.columns if 'mata' in str(c).lower() or 'matkul' in str(c).lower()), df_db.columns[0])
+        self.col_dos = next((c for c in df_db.columns if 'dosen' in str(c).lower() or 'pengajar' in str(c).lower()), df_db.columns[1])
+        self.col_jam = next((c for c in df_db.columns if 'jam' in str(c).lower() or 'waktu' in str(c).lower()), None)
+        self.col_kod = next((c for c in df_db.columns if 'kode' in str(c).lower()), None)
+        labels = (df_db[self.col_mtk].astype(str) + " - " + df_db[self.col_dos].astype(str))
+        if self.col_jam is not None: labels += " [" + df_db[self.col_jam].astype(str) + "]"
+        # Label kembar menunjuk ke baris pertama (sama seperti filter == lalu iloc[0])
+        first = {}
+        for i, label in enumerate(labels.tolist()): first.setdefault(label, i)
+        self.labels = list(first); self.rows = list(first.values())
+        self.records = df_db.iloc[self.rows].to_dict('records')
+        self.tokens = [frozenset(self.TOKEN.findall(label.lower())) for label in self.labels]
+        postings = defaultdict(list)
+        for i, toks in enumerate(self.tokens):
+            for t in toks: postings[t].append(i)
+        self.vocab = sorted(postings); self.postings = [np.array(postings[t], dtype=np.int64) for t in self.vocab]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _prefix(self, tok):
+        # Label yang punya kata berawalan tok (vocab terurut -> rentang bisect)
+        lo = bisect.bisect_left(self.vocab, tok); hi = bisect.bisect_left(self.vocab, tok + '\U0010ffff')
+        if lo == hi: return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(self.postings[lo:hi]))
+
+    def search(self, query, limit=50):
+        # -> (id label teratas, jumlah cocok). Urutan: kata persis terbanyak, lalu urutan DB.
+        q = self.TOKEN.findall(str(query).lower())
+        if not q: return list(range(min(limit, len(self.labels)))), len(self.labels)
+        hits = None
+        for tok in dict.fromkeys(q):
+            ids = self._prefix(tok)
+            hits = ids if hits is None else np.intersect1d(hits, ids, assume_unique=True)
+            if not len(hits): return [], 0
+        exact = np.array([sum(t in self.tokens[i] for t in q) for i in hits])
+        order = np.lexsort((hits, -exact))[:limit]
+        return hits[order].tolist(), len(hits)
+
+    def defaults(self, i):
+        # Isian form Single dari label ke-i
+        row = self.records[i]
+        out = {"matkul": str(row[self.col_mtk]), "dosen": str(row[self.col_dos]),
+               "kode": str(row[self.col_kod]) if self.col_kod is not None else ''}
+        if self.col_jam is not None:
+            raw_jam = str(row[self.col_jam]); out['jam_full'] = raw_jam
+            match_j = re.search(r'(\d{1,2})[:.](\d{2})', raw_jam)
+            if match_j: out['jam_mulai'] = f"{match_j.group(1)}:{match_j.group(2)}"
+        return out
+
+def enrich_with_db(df_batch, df_db):
+    if df_db is None or df_batch is None: return df_batch
+    index = df_db if isinstance(df_db, ScheduleIndex) else ScheduleIndex(df_db)
+    if not index.ok: return df_batch
+
+    def get_kode_smart(row):
+        if row['Kode Kelas'] not in ["N/A", ""]: return row['Kode Kelas']
+        return index.lookup(row['Mata Kuliah'], row['Nama Dosen'], row['Jam'])
+
+    df_batch['Kode Kelas'] = df_batch.apply(get_kode_smart, axis=1)
+    return df_batch
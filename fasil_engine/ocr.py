@@ -0,0 +1,335 @@
+import os
+import re
+import json
+import time
+import threading
+from io import BytesIO
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+from PIL import Image, ImageOps
+from .cache import ContentCache, content_key
+
+# OCR_MAX_SIDE / OCR_GRAYSCALE (env): downscale sisi terpanjang & grayscale sebelum OCR. Default mati (full
+# resolusi seperti dulu) sampai benchmarks/bench_ocr.py di screenshot asli menunjukkan all_same: true.
+OCR_SETTINGS = {"langs": ["en"], "gpu": False, "detail": 0, "max_side": int(os.environ.get("OCR_MAX_SIDE") or 0) or None,
+                "grayscale": (os.environ.get("OCR_GRAYSCALE") or "").strip().lower() in ("1", "true", "yes"), "crop": None,
+                "batch_size": 8, "layout": False}
+# Area crop (kiri, atas, kanan, bawah) dalam fraksi lebar/tinggi gambar
+OCR_CROPS = {"Full Screenshot": None, "Panel Peserta (kanan)": [0.68, 0.0, 1.0, 1.0]}
+
+_reader = None
+_reader_lock = threading.Lock()
+
+class OcrSlots:
+    # Batas OCR bersamaan untuk seluruh proses: semua sesi/job berbagi satu reader, sisanya antri
+    def __init__(self, limit):
+        self.limit = limit; self.sem = threading.BoundedSemaphore(limit)
+        self.lock = threading.Lock(); self.active = 0; self.waiting = 0
+
+    def __enter__(self):
+        with self.lock: self.waiting += 1
+        self.sem.acquire()
+        with self.lock: self.waiting -= 1; self.active += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self.lock: self.active -= 1
+        self.sem.release()
+
+    def stats(self):
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+# OCR_MAX_CONCURRENT (env): jumlah readtext yang boleh jalan bersamaan di satu server
+ocr_slots = OcrSlots(max(1, int(os.environ.get("OCR_MAX_CONCURRENT") or min(4, os.cpu_count() or 1))))
+
+# OCR_STARTUP (env): "lazy" (default, model dimuat saat foto pertama), "eager" (app memanggil start_warmup:
+# model dimuat + satu inferensi dummy di thread background), "off" (easyocr/torch tidak pernah di-import)
+OCR_STARTUP = (os.environ.get("OCR_STARTUP") or "lazy").strip().lower()
+_status = {"state": "idle", "load_s": None, "warm_s": None, "error": None}
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+def ocr_enabled():
+    return OCR_STARTUP != "off"
+
+def get_ocr_reader():
+    # easyocr (dan torch) baru di-import saat OCR benar-benar dipakai
+    global _reader
+    if not ocr_enabled(): raise RuntimeError("OCR dinonaktifkan (OCR_STARTUP=off)")
+    with _reader_lock:
+        if _reader is None:
+            _status["state"] = "loading"; t = time.perf_counter()
+            try:
+                import easyocr
+                _reader = easyocr.Reader(OCR_SETTINGS["langs"], gpu=OCR_SETTINGS["gpu"])
+            except Exception as e:
+                _status.update(state="error", error=f"{type(e).__name__}: {e}")
+                raise
+            _status.update(state="loaded", load_s=round(time.perf_counter() - t, 2))
+        return _reader
+
+def warm_up_reader():
+    # Load model lalu satu readtext di gambar kosong, supaya alokasi/inisialisasi pertama tidak dibayar user
+    try:
+        reader = get_ocr_reader()
+        _status["state"] = "warming"; t = time.perf_counter()
+        reader.readtext(np.full((64, 256), 255, dtype=np.uint8), detail=0)
+        _status.update(state="ready", warm_s=round(time.perf_counter() - t, 2))
+    except Exception as e:
+        if _status["state"] != "error": _status.update(state="error", error=f"{type(e).__name__}: {e}")
+
+def start_warmup():
+    # Sekali per proses; pemanggil tidak menunggu
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None and ocr_enabled():
+            _warmup_thread = threading.Thread(target=warm_up_reader, name="ocr-warmup", daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+def ocr_status():
+    # state: off / idle (belum dimuat) / loading / loaded / warming / ready / error
+    if not ocr_enabled(): return {**_status, "state": "off"}
+    return dict(_status)
+
+class OcrCache(ContentCache):
+    # Hasil OCR per hash (isi gambar + setting OCR). LRU di memori, opsional di disk.
+    suffix = ".txt"
+
+    def __init__(self, max_entries=512, disk_dir=None, disk_max_bytes=64 * 1024 * 1024):
+        super().__init__(max_entries, disk_dir, disk_max_bytes)
+
+    def key(self, data, settings=None):
+        return content_key(data, json.dumps(settings or OCR_SETTINGS, sort_keys=True))
+
+    def _read_disk(self, path):
+        with open(path, encoding='utf-8') as f: return f.read()
+
+    def _write_disk(self, path, value):
+        with open(path, 'w', encoding='utf-8') as f: f.write(value)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_ocr_cache():
+    # OCR_CACHE_DIR (env) mengaktifkan cache disk, dibagi antar sesi & restart
+    global _cache
+    with _cache_lock:
+        if _cache is None: _cache = OcrCache(disk_dir=os.environ.get("OCR_CACHE_DIR") or None)
+        return _cache
+
+def clean_ocr_result(result):
+    cleaned = []
+    ignore = ["participants", "chat", "share", "record", "host", "me", "mute", "unmute"]
+    for text in result:
+        t = text.strip()
+        if len(t) > 3 and not any(w in t.lower() for w in ignore):
+            t = re.sub(r'^\d+[\.\)]?\s*', '', t)
+            cleaned.append(t)
+    return "\n".join(cleaned)
+
+def preprocess_for_ocr(data, settings=None):
+    # Orientasi EXIF -> crop panel -> downscale sisi terpanjang -> grayscale
+    import cv2
+    settings = settings or OCR_SETTINGS
+    img = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    crop = settings.get("crop")
+    if crop:
+        w, h = img.size
+        img = img.crop((int(crop[0]*w), int(crop[1]*h), int(crop[2]*w), int(crop[3]*h)))
+    arr = np.array(img.convert("RGB"))
+    max_side = settings.get("max_side")
+    if max_side and max(arr.shape[:2]) > max_side:
+        scale = max_side / max(arr.shape[:2])
+        arr = cv2.resize(arr, (max(1, round(arr.shape[1]*scale)), max(1, round(arr.shape[0]*scale))), interpolation=cv2.INTER_AREA)
+    if settings.get("grayscale"): arr = cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
+    return arr
+
+# --- LAYOUT-AWARE: detect -> pilih kotak kolom nama -> recognize kotak itu saja ---
+def box_bounds(horizontal, free, shape):
+    # Kotak easyocr -> (x0, x1, y0, y1) dipotong ke ukuran gambar (seperti yang dipakai recognize);
+    # kotak miring (free_list) diambil bounding box-nya
+    h, w = shape[:2]
+    boxes = [tuple(int(v) for v in b) for b in horizontal]
+    for poly in free:
+        xs = [p[0] for p in poly]; ys = [p[1] for p in poly]
+        boxes.append((int(min(xs)), int(max(xs)), int(min(ys)), int(max(ys))))
+    boxes = [(max(0, x0), min(x1, w), max(0, y0), min(y1, h)) for x0, x1, y0, y1 in boxes]
+    return [b for b in boxes if b[1] > b[0] and b[3] > b[2]]
+
+def select_name_rows(boxes):
+    # Daftar peserta = kolom rata kiri. Kotak terlalu kecil/besar dibuang, tepi kiri dengan total lebar teks
+    # terbesar jadi kolom nama (label pendek seperti "Mute" yang juga sejajar kalah), kotak di kanan yang
+    # menempel di baris yang sama ikut, baris yang jauh lebih rapat dari jarak antar peserta digabung
+    # (nama panjang yang turun ke baris berikut), baris yang terpisah jauh dari daftar dibuang.
+    # -> list baris, tiap baris list kotak (x0, x1, y0, y1) berurutan kiri ke kanan.
+    if not boxes: return []
+    h = float(np.median([b[3] - b[2] for b in boxes]))
+    boxes = [b for b in boxes if 0.5 * h <= b[3] - b[2] <= 2.0 * h and b[1] - b[0] >= h]
+    if not boxes: return []
+    tol = max(2.0, 0.8 * h)
+    lefts = np.array([b[0] for b in boxes]); widths = np.array([b[1] - b[0] for b in boxes])
+    x_col = lefts[int(np.argmax([widths[np.abs(lefts - x) <= tol].sum() for x in lefts]))]
+    rows = [[b] for b in sorted((b for b in boxes if abs(b[0] - x_col) <= tol), key=lambda b: b[2])]
+    rest = sorted((b for b in boxes if b[0] > x_col + tol), key=lambda b: b[0])
+    for row in rows:
+        y0, y1 = row[0][2], row[0][3]
+        for b in rest:
+            overlap = min(y1, b[3]) - max(y0, b[2])
+            if overlap > 0.5 * min(y1 - y0, b[3] - b[2]) and 0 <= b[0] - row[-1][1] <= 0.8 * h: row.append(b)
+    if len(rows) > 2:
+        centers = [(r[0][2] + r[0][3]) / 2 for r in rows]
+        gaps = np.diff(centers)
+        # Jarak antar peserta: persentil 75 (baris lanjutan tidak menarik turun), tanpa celah besar seperti judul panel
+        pitch = float(np.percentile(gaps[gaps <= 2 * np.median(gaps)], 75))
+        keep = [i for i in range(len(rows)) if min(gaps[i - 1] if i else np.inf, gaps[i] if i < len(gaps) else np.inf) <= 3 * pitch]
+        merged = []
+        for i in keep:
+            if merged and 0 < centers[i] - centers[merged[-1][0]] < 0.7 * pitch:
+                merged[-1].append(i)
+            else: merged.append([i])
+        rows = [[b for i in group for b in rows[i]] for group in merged]
+    return rows
+
+def ocr_layout(arr, reader):
+    # Dua tahap easyocr: reader.detect di seluruh gambar, reader.recognize hanya di kotak kolom nama
+    with ocr_slots:
+        horizontal, free = reader.detect(arr)
+        rows = select_name_rows(box_bounds(horizontal[0], free[0], arr.shape))
+        flat = [b for row in rows for b in row]
+        found = reader.recognize(arr, horizontal_list=[list(b) for b in flat], free_list=[], detail=1) if flat else []
+    # Urutan hasil recognize tidak dijamin (versi batched/GPU mengurutkan crop), jadi teks selalu
+    # dicocokkan ke kotaknya lewat pojok kiri atas
+    by_corner = {(int(f[0][0][0]), int(f[0][0][1])): f[1] for f in found}
+    texts = {b: by_corner.get((b[0], b[2]), "") for b in flat}
+    return clean_ocr_result(" ".join(t for t in (texts[b].strip() for b in row) if t) for row in rows)
+
+def ocr_image_bytes(data, reader, settings=None):
+    settings = settings or OCR_SETTINGS
+    arr = preprocess_for_ocr(data, settings)
+    if settings.get("layout"): return ocr_layout(arr, reader)
+    with ocr_slots: result = reader.readtext(arr, detail=settings["detail"])
+    return clean_ocr_result(result)
+
+def ocr_arrays_batched(arrays, reader, settings=None):
+    # Gambar dengan ukuran sama dikirim sekaligus ke readtext_batched; sisanya readtext biasa.
+    # Mode layout tidak punya versi batched: tiap gambar detect + recognize sendiri.
+    settings = settings or OCR_SETTINGS
+    if settings.get("layout"): return [ocr_layout(arr, reader) for arr in arrays]
+    groups = defaultdict(list)
+    for i, arr in enumerate(arrays): groups[arr.shape].append(i)
+    results = [None] * len(arrays)
+    for ids in groups.values():
+        if len(ids) == 1:
+            with ocr_slots: results[ids[0]] = clean_ocr_result(reader.readtext(arrays[ids[0]], detail=settings["detail"]))
+            continue
+        with ocr_slots: out = reader.readtext_batched([arrays[i] for i in ids], detail=settings["detail"], batch_size=settings["batch_size"])
+        for i, res in zip(ids, out): results[i] = clean_ocr_result(res)
+    return results
+
+def ocr_cached(data, cache, reader=None, settings=None):
+    settings = settings or OCR_SETTINGS
+    key = cache.key(data, settings)
+    text = cache.get(key)
+    if text is None:
+        text = ocr_image_bytes(data, reader or get_ocr_reader(), settings)
+        cache.put(key, text)
+    return text
+
+def read_image_bytes(src):
+    # src: bytes, path, atau file-like (UploadedFile / open())
+    if isinstance(src, (bytes, bytearray)): return bytes(src)
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, 'rb') as f: return f.read()
+    src.seek(0)
+    return src.read()
+
+def extract_text_from_image(image_file, settings=None):
+    try:
+        return ocr_cached(read_image_bytes(image_file), get_ocr_cache(), settings=settings)
+    except: return ""
+
+def extract_texts_parallel(files, workers=4, on_progress=None, settings=None, batched=False, timings=None, cancel=None):
+    # files: {nama_file: bytes/path/file/ZipMember}. Tiap worker membaca foto sendiri, cek cache, lalu OCR,
+    # jadi paling banyak `workers` gambar mentah ada di memori. batched=True: baca+preproses paralel,
+    # lalu dikenali per grup lewat readtext_batched.
+    # timings (dict, opsional) diisi {nama_file: (ms, "cache"|"ocr"|"batched"|"error"|"cancelled")}.
+    # cancel (threading.Event, opsional): foto yang belum di-OCR dilewati begitu event di-set. Kalau on_progress
+    # melempar exception (mis. JobCancelled), antrian worker dibatalkan dan exception diteruskan tanpa menunggu.
+    if not files: return {}
+    settings = settings or OCR_SETTINGS
+    cache = get_ocr_cache()
+    timings = {} if timings is None else timings
+    results = {}
+    reader_box = {}; reader_lock = threading.Lock()
+
+    def reader():
+        # Model baru dimuat saat foto pertama yang tidak ada di cache; gagal sekali -> semua "error"
+        with reader_lock:
+            if not reader_box:
+                try: reader_box["r"] = get_ocr_reader()
+                except Exception as e: reader_box["e"] = e
+        if "e" in reader_box: raise reader_box["e"]
+        return reader_box["r"]
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    def load(src):
+        data = read_image_bytes(src); key = cache.key(data, settings)
+        return data, key, cache.get(key)
+
+    def prep(src):
+        t = time.perf_counter()
+        if cancelled(): return None, None, None, 0.0
+        try:
+            data, key, text = load(src)
+            arr = None if text is not None else preprocess_for_ocr(data, settings)
+            return key, text, arr, time.perf_counter() - t
+        except: return None, None, None, time.perf_counter() - t
+
+    def work(src):
+        t = time.perf_counter()
+        if cancelled(): return "", 0.0, "cancelled"
+        try:
+            data, key, text = load(src)
+            if text is not None: return text, (time.perf_counter() - t) * 1000, "cache"
+            if cancelled(): return "", (time.perf_counter() - t) * 1000, "cancelled"
+            text = ocr_image_bytes(data, reader(), settings)
+            cache.put(key, text)
+            return text, (time.perf_counter() - t) * 1000, "ocr"
+        except: return "", (time.perf_counter() - t) * 1000, "error"
+
+    pool = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+    try:
+        if batched:
+            prepped = dict(zip(files, pool.map(prep, files.values())))
+            for name, (_, text, _, s) in prepped.items():
+                if text is not None: results[name] = text; timings[name] = (s * 1000, "cache")
+            if on_progress and results: on_progress(len(results), len(files), "cache")
+            names = [n for n, (_, text, arr, _) in prepped.items() if text is None and arr is not None]
+            t = time.perf_counter()
+            try: texts = dict(zip(names, ocr_arrays_batched([prepped[n][2] for n in names], reader(), settings))) if names and not cancelled() else {}
+            except: texts = {}
+            # Waktu recognize dibagi rata ke semua gambar dalam batch
+            share = (time.perf_counter() - t) / max(1, len(names))
+            for name, (key, text, _, s) in prepped.items():
+                if text is not None: continue
+                results[name] = texts.get(name, "")
+                timings[name] = ((s + share) * 1000, "batched" if name in texts else "cancelled" if cancelled() else "error")
+                if name in texts: cache.put(key, texts[name])
+                if on_progress: on_progress(len(results), len(files), name)
+            return results
+
+        futures = {pool.submit(work, src): name for name, src in files.items()}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            results[name], ms, source = fut.result()
+            timings[name] = (ms, source)
+            if on_progress: on_progress(len(results), len(files), name)
+        return results
+    finally:
+        # Normalnya semua sudah selesai; kalau keluar karena exception (job dibatalkan), foto yang masih antri
+        # tidak dijalankan dan tidak ditunggu
+        pool.shutdown(wait=False, cancel_futures=True)
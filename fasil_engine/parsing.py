@@ -0,0 +1,158 @@
+import codecs
+import re
+import pandas as pd
+
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+def get_session_list(pertemuan_str):
+    clean_str = str(pertemuan_str).replace('&', ',').replace('-', ',').replace('dan', ',').replace('Pertemuan', '')
+    return [int(x) for x in clean_str.split(',') if x.strip().isdigit()]
+
+RE_SPACES = re.compile(r'[\t\s]+')
+RE_DOUBLED = re.compile(r'^(.+?)\s*\1$', re.IGNORECASE)
+
+def clean_matkul_smart(text):
+    clean = RE_SPACES.sub(' ', text).strip()
+    match = RE_DOUBLED.match(clean)
+    if match: return match.group(1) 
+    return clean
+
+# --- PARSERS ---
+def parse_data_template(text):
+    data = {}
+    jam_match = re.search(r'(\d{1,2}[\.:]\d{2})\s?-\s?(\d{1,2}[\.:]\d{2})', text)
+    if jam_match:
+        data['jam_mulai'] = jam_match.group(1).replace(':', '.')
+        data['jam_full'] = jam_match.group(0).replace('.', ':')
+        parts = text.split(jam_match.group(0))
+        raw_prefix = parts[0].strip()
+        fasil_clean = raw_prefix
+        for day in DAYS:
+            if fasil_clean.lower().startswith(day.lower()):
+                fasil_clean = fasil_clean[len(day):].strip(); break
+        data['fasil'] = fasil_clean if fasil_clean else "Fasil"
+        sisa = parts[1] if len(parts) > 1 else text
+    else:
+        data['jam_mulai'] = "00.00"; data['jam_full'] = "00:00 - 00:00"; data['fasil'] = "Fasil"; sisa = text
+
+    kode_match = re.search(r'([A-Za-z]{2,}\d{1,3})', sisa)
+    if kode_match:
+        data['kode'] = kode_match.group(1)
+        parts_kode = sisa.split(data['kode'])
+        data['matkul'] = clean_matkul_smart(parts_kode[0].strip())
+        raw_dosen = parts_kode[1] if len(parts_kode) > 1 else ""
+        clean_dosen = re.split(r'(\d{2}[A-Za-z]|\d{2}\s|Reg|Pro|Sulawesi|Bali|Java|Sumatera|Papua|Pertemuan|\d+\s?STI)', raw_dosen, flags=re.IGNORECASE)[0]
+        data['dosen'] = clean_dosen.strip().strip(",").strip()
+    else:
+        data['kode'] = "KODE"; data['matkul'] = "Matkul"; data['dosen'] = "Dosen"
+
+    pertemuan_match = re.search(r'(Pertemuan\s?[\d\s&,-]+)', text, re.IGNORECASE)
+    data['pertemuan_str'] = pertemuan_match.group(1).strip() if pertemuan_match else "Pertemuan 1"
+    
+    types = []
+    if re.search(r'Reguler|Reg', text, re.IGNORECASE): types.append("Reguler")
+    if re.search(r'Profesional|Pro', text, re.IGNORECASE): types.append("Profesional")
+    data['tipe_str'] = types[0] if types else "Reguler"
+    return data
+
+# Tokenizer batch satu lintasan. Hasil sama dengan versi lama (sub \s*_\s* -> sub "(Part n)" -> split jam),
+# tapi teks dibaca per potongan: file besar tidak perlu dimuat utuh dan baris keluar bertahap.
+RE_UNDERSCORE = re.compile(r'\s*_\s*')
+RE_ENTRY_END = re.compile(r'_(\d{1,2}[\.:]\d{2})(?:\s*\(part\s*(\d+)\))?', re.IGNORECASE)
+RE_PART_PREFIX = re.compile(r'\s*(?:\((?:p(?:a(?:r(?:t\s*\d*)?)?)?)?)?', re.IGNORECASE)
+RE_TIPE = re.compile(r'(Reguler|Profesional|Professional|International|Reg|Pro)', re.IGNORECASE)
+RE_DAYS = [re.compile(day, re.IGNORECASE) for day in DAYS]
+RE_TAHUN = re.compile(r'202\d')
+RE_DIGITS = re.compile(r'\d+')
+RE_UNSAFE = re.compile(r'[\\/*?:"<>|]')
+CHUNK_SIZE = 1 << 16
+
+def iter_text_chunks(source, size=CHUNK_SIZE):
+    # source: str, bytes, file teks/biner (open(), UploadedFile), atau iterable potongan str
+    if isinstance(source, str): yield source; return
+    if isinstance(source, (bytes, bytearray)): yield bytes(source).decode('utf-8-sig'); return
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'): source.seek(0)
+        decoder = None
+        while True:
+            chunk = source.read(size)
+            if not chunk: break
+            if isinstance(chunk, (bytes, bytearray)):
+                decoder = decoder or codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+                chunk = decoder.decode(chunk)
+            yield chunk
+        if decoder: yield decoder.decode(b'', final=True)
+        return
+    yield from source
+
+def _safe_cut(buf):
+    # Posisi potong terakhir yang tidak bisa dilewati match \s*_\s* (kiri & kanan bukan spasi/_)
+    for p in range(len(buf) - 1, 0, -1):
+        if not (buf[p].isspace() or buf[p] == '_' or buf[p-1].isspace() or buf[p-1] == '_'): return p
+    return 0
+
+def iter_batch_entries(source):
+    # Potongan "<...>_<jam>" per kelas. Entry baru dikeluarkan kalau jamnya pasti tidak
+    # diikuti "(Part n)" yang belum terbaca.
+    buf = ""; pending = ""; first = True
+    def scan(final):
+        nonlocal buf, first
+        pos = 0
+        for m in RE_ENTRY_END.finditer(buf):
+            if not final and m.group(2) is None and RE_PART_PREFIX.fullmatch(buf, m.end()): break
+            piece = buf[pos:m.start()]
+            if first: piece = piece.lstrip(); first = False
+            entry = f"{piece}_Pertemuan {m.group(2)}_{m.group(1)}" if m.group(2) is not None else f"{piece}_{m.group(1)}"
+            pos = m.end()
+            if len(entry) > 10: yield entry
+        buf = buf[pos:]
+    for chunk in iter_text_chunks(source):
+        pending += chunk
+        cut = _safe_cut(pending)
+        if cut:
+            buf += RE_UNDERSCORE.sub('_', pending[:cut]); pending = pending[cut:]
+            yield from scan(False)
+    buf += RE_UNDERSCORE.sub('_', pending)
+    yield from scan(True)
+
+def parse_batch_entry(entry):
+    parts = entry.split('_')
+    jam = parts[-1].strip().replace('.', ':').zfill(5)
+    dosen = parts[-2].strip()
+    val_min_3 = parts[-3].strip()
+    if RE_TIPE.search(val_min_3):
+        tipe = val_min_3; tgl_raw = parts[-4].strip(); sesi_raw = parts[-5].strip(); front_blob = parts[:-5]
+    else:
+        tipe = "Reguler"; tgl_raw = val_min_3; sesi_raw = parts[-4].strip(); front_blob = parts[:-4]
+
+    front_text = "_".join(front_blob)
+    fasil = "Fasil"; temp_text = front_text
+    for day_re in RE_DAYS:
+        # Setara re.search(f"(.*?)({day})"): '.' berhenti di newline, jadi fasil = awal baris s/d hari
+        match = day_re.search(front_text)
+        if match:
+            fasil = front_text[front_text.rfind('\n', 0, match.start()) + 1:match.start()].strip()
+            temp_text = front_text[match.end():]; break
+
+    match_tahun = RE_TAHUN.search(temp_text)
+    matkul_messy = temp_text[match_tahun.end():].strip() if match_tahun else temp_text
+    matkul = clean_matkul_smart(matkul_messy)
+
+    sessions_found = RE_DIGITS.findall(sesi_raw) or ['1']
+    req_zoom_combined = f"{matkul}_{sesi_raw}_{tgl_raw}_{tipe}_{dosen}_{jam}"
+    clean_tgl = tgl_raw.replace(",", ""); clean_dos = RE_UNSAFE.sub("", dosen); clean_mat = RE_UNSAFE.sub("", matkul)
+    return [{"Tanggal": tgl_raw, "Fasilitator": fasil, "Jam": jam,
+             "Kode Kelas": "N/A", "Mata Kuliah": matkul, "Nama Dosen": dosen,
+             "Tipe": tipe, "Sesi": sess_num, "Req Zoom": req_zoom_combined,
+             "Nama File Foto": f"{clean_tgl}_{clean_dos}_{clean_mat}_{fasil}_Pertemuan {sess_num}.jpg"} for sess_num in sessions_found]
+
+def iter_batch_rows(source):
+    # Baris batch (dict) satu per satu; entry yang formatnya rusak dilewati
+    for entry in iter_batch_entries(source):
+        try: rows = parse_batch_entry(entry)
+        except Exception: continue
+        yield from rows
+
+def parse_random_batch_text(raw_text):
+    # raw_text: teks paste, atau file/stream teks (lihat iter_text_chunks)
+    return pd.DataFrame(list(iter_batch_rows(raw_text)))
@@ -0,0 +1,120 @@
+# Foto bukti batch: ZIP yang dibaca per member (lazy), pencocokan nama file ke kolom "Nama File Foto",
+# dan ZIP keluaran berisi foto yang di-rename sesuai kolom itu, ditulis streaming.
+import difflib
+import operator
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections.abc import Mapping
+
+IMG_EXT = ('.jpg', '.jpeg', '.png')
+FUZZY_CUTOFF = 0.85
+
+class ZipMember:
+    # File-like minimal (seek/read) untuk read_image_bytes; isi baru didekompres saat dibaca
+    def __init__(self, photos, key, info):
+        self.photos = photos; self.key = key; self.info = info
+        self.name = info.filename
+        self.content_id = f"zip:{info.CRC:08x}:{info.file_size}"  # sidik jari tanpa membaca isi
+
+    def seek(self, pos, whence=0):
+        return 0
+
+    def read(self, size=-1):
+        with self.photos.lock: return self.photos.zf.read(self.info)
+
+    def copy_to(self, out):
+        with self.photos.lock, self.photos.zf.open(self.info) as src: shutil.copyfileobj(src, out, 1 << 20)
+
+    def __reduce__(self):
+        return operator.getitem, (self.photos, self.key)
+
+class ZipPhotos(Mapping):
+    # nama file (tanpa folder) -> ZipMember. Saat dibuka hanya direktori pusat ZIP yang dibaca.
+    # Dari path bisa di-pickle (run_batch_sharded: tiap proses membuka ZIP sendiri).
+    def __init__(self, src):
+        self.path = os.fspath(src) if isinstance(src, (str, os.PathLike)) else None
+        self.zf = zipfile.ZipFile(src); self.lock = threading.Lock()
+        self.members = {}
+        for info in self.zf.infolist():
+            base = os.path.basename(info.filename)
+            if info.is_dir() or base.startswith('.') or '__MACOSX' in info.filename or not base.lower().endswith(IMG_EXT): continue
+            if base not in self.members: self.members[base] = ZipMember(self, base, info)
+
+    def __getitem__(self, name): return self.members[name]
+    def __iter__(self): return iter(self.members)
+    def __len__(self): return len(self.members)
+
+    def close(self):
+        self.zf.close()
+
+    def __reduce__(self):
+        if self.path is None: raise TypeError("ZipPhotos dari file-like tidak bisa dikirim ke proses lain")
+        return ZipPhotos, (self.path,)
+
+def photo_key(name):
+    # "12 Feb 2024_Dr. Budi_Basis Data_Andi_Pertemuan 1.JPG" -> "12 feb 2024 dr budi basis data andi pertemuan 1"
+    base = os.path.splitext(os.path.basename(str(name)))[0].lower()
+    return " ".join(re.findall(r'[^\W_]+', base))
+
+def align_photos(expected, photos, cutoff=FUZZY_CUTOFF):
+    # expected: nama di kolom "Nama File Foto"; photos: {nama file: sumber}.
+    # -> ({nama diminta: sumber}, [nama tanpa foto]). Urutan: persis, ternormalisasi, lalu fuzzy
+    # (difflib) di antara foto yang belum terpakai dan hanya kalau angka-angkanya (tanggal, sesi) sama.
+    by_key = {}
+    for name in photos: by_key.setdefault(photo_key(name), name)
+    aligned = {}; used = set(); pending = []
+    for want in dict.fromkeys(str(w) for w in expected if str(w).strip()):
+        name = want if want in photos else by_key.get(photo_key(want))
+        if name is None: pending.append(want); continue
+        aligned[want] = photos[name]; used.add(name)
+    free = {}
+    for key, name in by_key.items():
+        if name not in used: free.setdefault(tuple(re.findall(r'\d+', key)), []).append(key)
+    missing = []
+    for want in pending:
+        key = photo_key(want); pool = free.get(tuple(re.findall(r'\d+', key)), [])
+        best = difflib.get_close_matches(key, pool, n=1, cutoff=cutoff)
+        if not best: missing.append(want); continue
+        aligned[want] = photos[by_key[best[0]]]; pool.remove(best[0])
+    return aligned, missing
+
+def source_name(src):
+    # Nama file asal (untuk ekstensi), kalau bisa diketahui
+    if isinstance(src, (str, os.PathLike)): return str(src)
+    return getattr(src, 'name', '') or ''
+
+def copy_photo(src, out):
+    if hasattr(src, 'copy_to'): src.copy_to(out)
+    elif isinstance(src, (bytes, bytearray)): out.write(src)
+    elif isinstance(src, (str, os.PathLike)):
+        with open(src, 'rb') as f: shutil.copyfileobj(f, out, 1 << 20)
+    else:
+        src.seek(0); shutil.copyfileobj(src, out, 1 << 20)
+
+def write_photo_zip(pairs, dest):
+    # pairs: iterable (nama baru, sumber foto), ditulis satu per satu ke dest (path / file biner).
+    # JPEG/PNG sudah terkompresi -> ZIP_STORED; ekstensi mengikuti file asal. Nama kembar dilewati.
+    used = set(); count = 0
+    with zipfile.ZipFile(dest, 'w', zipfile.ZIP_STORED, allowZip64=True) as out:
+        for new_name, src in pairs:
+            stem, ext = os.path.splitext(re.sub(r'[\\/*?:"<>|]', '', str(new_name)))
+            ext = os.path.splitext(source_name(src))[1].lower() or ext or '.jpg'
+            arcname = stem + ext
+            if not stem or arcname.lower() in used: continue
+            used.add(arcname.lower())
+            with out.open(arcname, 'w', force_zip64=True) as w: copy_photo(src, w)
+            count += 1
+    return count
+
+def to_photo_zip_path(pairs):
+    # ZIP ditulis ke file temp di disk (pemanggil yang menghapus) -> (path, jumlah foto)
+    fd, path = tempfile.mkstemp(prefix="fasil_foto_", suffix=".zip")
+    try:
+        with os.fdopen(fd, 'wb') as f: count = write_photo_zip(pairs, f)
+    except BaseException:
+        os.remove(path); raise
+    return path, count
@@ -0,0 +1,103 @@
+# Instrumentasi run batch: waktu & jumlah panggilan per tahap, counter, metrik per baris,
+# dan (opsional) profil cProfile dari loop batch.
+import cProfile
+import io
+import json
+import marshal
+import pstats
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+class RunReport:
+    def __init__(self, profile=False):
+        self.stages = {}    # tahap -> {"calls", "seconds", **extra}, urut sesuai pertama kali dipakai
+        self.counters = {}
+        self.rows = []
+        self.meta = {"started": time.strftime("%Y-%m-%d %H:%M:%S")}
+        self.profiler = cProfile.Profile() if profile else None
+        self.profile_stats = None  # dict pstats setelah finish(), bisa di-pickle antar proses
+        self.t0 = time.perf_counter(); self.wall = None
+
+    @contextmanager
+    def stage(self, name, calls=1, **extra):
+        t = time.perf_counter()
+        try: yield
+        finally: self.add(name, time.perf_counter() - t, calls, **extra)
+
+    def add(self, name, seconds, calls=1, **extra):
+        # extra: jumlah tambahan per tahap (mis. rows=) yang bukan jumlah panggilan, dijumlah seperti calls
+        s = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        s["calls"] += calls; s["seconds"] += seconds
+        for k, v in extra.items(): s[k] = s.get(k, 0) + v
+
+    def count(self, name, k=1):
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    def row(self, **fields):
+        self.rows.append(fields)
+
+    @contextmanager
+    def profiling(self):
+        # Hanya thread pemanggil yang terprofil (thread OCR tidak ikut)
+        if self.profiler is None:
+            yield; return
+        self.profiler.enable()
+        try: yield
+        finally: self.profiler.disable()
+
+    def finish(self):
+        self.wall = time.perf_counter() - self.t0
+        if self.profiler is not None:
+            self.profiler.create_stats(); self.profile_stats = self.profiler.stats; self.profiler = None
+        return self
+
+    def merge(self, other):
+        # Gabung laporan shard (run_batch_sharded); profil tidak digabung
+        for name, s in other.stages.items(): self.add(name, **s)
+        for name, k in other.counters.items(): self.count(name, k)
+        self.rows += other.rows
+        return self
+
+    def total_seconds(self):
+        return self.wall if self.wall is not None else time.perf_counter() - self.t0
+
+    def breakdown(self):
+        total = self.total_seconds() or 1e-9
+        return pd.DataFrame([{"Tahap": name, "Panggilan": s["calls"], "Detik": round(s["seconds"], 3),
+                              "ms/panggilan": round(s["seconds"] / s["calls"] * 1000, 2) if s["calls"] else None,
+                              "% total": round(s["seconds"] / total * 100, 1),
+                              "Info": ", ".join(f"{k}={v}" for k, v in s.items() if k not in ("calls", "seconds"))}
+                             for name, s in self.stages.items()],
+                            columns=["Tahap", "Panggilan", "Detik", "ms/panggilan", "% total", "Info"])
+
+    def rows_frame(self):
+        return pd.DataFrame(self.rows)
+
+    def to_dict(self):
+        return {"meta": {**self.meta, "total_seconds": round(self.total_seconds(), 3)},
+                "stages": self.breakdown().to_dict("records"), "counters": dict(self.counters), "rows": self.rows}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+    def to_csv(self):
+        # CSV per baris batch; ringkasan per tahap ada di to_json()/breakdown()
+        return self.rows_frame().to_csv(index=False)
+
+    def profile_text(self, limit=40, sort="cumulative"):
+        if not self.profile_stats: return ""
+        out = io.StringIO()
+        stats = pstats.Stats(_StatsHolder(self.profile_stats), stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def profile_bytes(self):
+        # Format sama dengan pstats.dump_stats -> bisa dibuka snakeviz / pstats.Stats(path)
+        return marshal.dumps(self.profile_stats) if self.profile_stats else b""
+
+class _StatsHolder:
+    # pstats.Stats menerima objek dengan create_stats() + .stats
+    def __init__(self, stats): self.stats = stats
+    def create_stats(self): pass
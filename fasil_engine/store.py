@@ -0,0 +1,132 @@
+# Penyimpanan lokal opsional (SQLite) untuk Master Mhs, Feedback dan DB Jadwal. File di-import sekali per
+# (jenis, kelas, semester); tabelnya dan index matching yang sudah jadi (RosterIndex, ScheduleIndex, SchedulePicker, FeedbackIndex) disimpan, jadi run berikutnya tidak
+# membaca ulang Excel dan tidak membangun index dari nol. Aktif kalau FASIL_STORE=/path/store.sqlite.
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from .analysis import FeedbackIndex, roster_names
+from .batch import frame_key
+from .cache import ContentCache
+from .matching import RosterIndex, ScheduleIndex, SchedulePicker
+
+KINDS = ("master", "feedback", "jadwal")
+INDEX_VERSION = 1  # naikkan kalau struktur RosterIndex/ScheduleIndex/SchedulePicker/FeedbackIndex berubah
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, kelas TEXT NOT NULL, semester TEXT NOT NULL,
+    source TEXT, content_key TEXT, n_rows INTEGER, columns TEXT, imported TEXT, frame BLOB,
+    UNIQUE (kind, kelas, semester));
+CREATE TABLE IF NOT EXISTS indexes (
+    dataset_id INTEGER NOT NULL, kind TEXT NOT NULL, ref INTEGER NOT NULL DEFAULT 0, version INTEGER, blob BLOB,
+    PRIMARY KEY (dataset_id, kind, ref));
+"""
+
+class DataStore:
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self.loaded = ContentCache(max_entries=16)  # (jenis, id...) -> objek yang sudah di-unpickle
+
+    def _query(self, sql, args=()):
+        with self.lock: return self.db.execute(sql, args).fetchall()
+
+    # --- IMPORT ---
+    def import_frame(self, kind, df, kelas="", semester="", source=""):
+        # -> id dataset. Isi sama dengan yang tersimpan -> tidak diapa-apakan; beda -> diganti (id baru) + index dibangun ulang
+        if kind not in KINDS: raise ValueError(f"kind harus salah satu dari {KINDS}")
+        key = frame_key(df)
+        row = self._query("SELECT id, content_key FROM datasets WHERE kind=? AND kelas=? AND semester=?", (kind, kelas, semester))
+        if row and row[0][1] == key: return row[0][0]
+        with self.lock, self.db:
+            if row: self._delete(row[0][0])
+            cur = self.db.execute("INSERT INTO datasets (kind, kelas, semester, source, content_key, n_rows, columns, imported, frame) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (kind, kelas, semester, source, key, len(df), json.dumps([str(c) for c in df.columns]),
+                                   time.strftime("%Y-%m-%d %H:%M:%S"), pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)))
+            dataset_id = cur.lastrowid
+        # Index dibangun sekarang, bukan saat batch pertama
+        if kind == "master": self.roster_index(dataset_id)
+        elif kind == "jadwal": self.schedule_index(dataset_id); self.schedule_picker(dataset_id)
+        return dataset_id
+
+    def _delete(self, dataset_id):
+        self.db.execute("DELETE FROM indexes WHERE dataset_id=? OR (kind='feedback' AND ref=?)", (dataset_id, dataset_id))
+        self.db.execute("DELETE FROM datasets WHERE id=?", (dataset_id,))
+        self._forget(dataset_id)
+
+    def _forget(self, dataset_id):
+        # Objek di memori milik dataset ini: ("frame", id), (jenis, id, ref) dan ("feedback", fb, id) milik master ini
+        with self.loaded.lock:
+            for key in [k for k in self.loaded.mem if dataset_id in k[1:]]: del self.loaded.mem[key]
+
+    def delete(self, dataset_id):
+        with self.lock, self.db: self._delete(dataset_id)
+
+    # --- QUERY ---
+    def datasets(self, kind=None):
+        rows = self._query("SELECT id, kind, kelas, semester, source, n_rows, imported FROM datasets WHERE ? IS NULL OR kind=? "
+                           "ORDER BY semester DESC, kelas, kind", (kind, kind))
+        return pd.DataFrame(rows, columns=["id", "kind", "kelas", "semester", "source", "rows", "imported"])
+
+    def find(self, kind, kelas="", semester=""):
+        row = self._query("SELECT id FROM datasets WHERE kind=? AND kelas=? AND semester=?", (kind, kelas, semester))
+        return row[0][0] if row else None
+
+    def frame(self, dataset_id):
+        hit = self.loaded.get(("frame", dataset_id))
+        if hit is None:
+            row = self._query("SELECT frame FROM datasets WHERE id=?", (dataset_id,))
+            if not row: raise KeyError(dataset_id)
+            hit = pickle.loads(row[0][0]); self.loaded.put(("frame", dataset_id), hit)
+        return hit.copy()
+
+    # --- INDEX SIAP PAKAI ---
+    def _index(self, dataset_id, kind, build, ref=0):
+        mem_key = (kind, dataset_id, ref)
+        hit = self.loaded.get(mem_key)
+        if hit is not None: return hit
+        row = self._query("SELECT version, blob FROM indexes WHERE dataset_id=? AND kind=? AND ref=?", (dataset_id, kind, ref))
+        if row and row[0][0] == INDEX_VERSION: obj = pickle.loads(row[0][1])
+        else:
+            obj = build()
+            with self.lock, self.db:
+                self.db.execute("INSERT OR REPLACE INTO indexes VALUES (?, ?, ?, ?, ?)",
+                                (dataset_id, kind, ref, INDEX_VERSION, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)))
+        self.loaded.put(mem_key, obj)
+        return obj
+
+    def roster_index(self, master_id):
+        return self._index(master_id, "roster", lambda: RosterIndex(roster_names(self.frame(master_id))))
+
+    def schedule_index(self, jadwal_id):
+        return self._index(jadwal_id, "schedule", lambda: ScheduleIndex(self.frame(jadwal_id)))
+
+    def schedule_picker(self, jadwal_id):
+        return self._index(jadwal_id, "picker", lambda: SchedulePicker(self.frame(jadwal_id)))
+
+    def feedback_index(self, feedback_id, master_id):
+        # Nama feedback sudah dicocokkan ke master tertentu -> disimpan per pasangan (feedback, master)
+        return self._index(feedback_id, "feedback", lambda: FeedbackIndex(self.frame(feedback_id), self.roster_index(master_id)), ref=master_id)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    # FASIL_STORE (env): path file SQLite; tanpa variabel ini store tidak dipakai (None)
+    global _store
+    path = os.environ.get("FASIL_STORE")
+    if not path: return None
+    with _store_lock:
+        if _store is None or _store.path != path: _store = DataStore(path)
+        return _store
@@ -0,0 +1,66 @@
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from fasil_engine import batch, ocr
+
+# Helper & fixture bersama: foto sintetis, frame batch, reader palsu, nama acak (roster/Zoom), cache baru per tes
+
+NAMES = ["Andi Saputra", "Budi Santoso", "Citra Lestari"]
+
+class FakeReader:
+    def readtext(self, arr, detail=0):
+        return list(NAMES)
+
+def broken_reader():
+    raise RuntimeError("model tidak bisa dimuat")
+
+@pytest.fixture
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(batch, "_row_cache", batch.RowCache())
+    monkeypatch.setattr(ocr, "_cache", ocr.OcrCache())
+
+def photo(seed):
+    buf = BytesIO(); Image.fromarray(np.full((40, 60, 3), seed, dtype=np.uint8)).save(buf, "PNG")
+    return buf.getvalue()
+
+def batch_frame(n):
+    return pd.DataFrame([{"Tanggal": "12 Feb 2024", "Fasilitator": "Andi", "Jam": "08:00", "Kode Kelas": "N/A",
+                          "Mata Kuliah": "Basis Data", "Nama Dosen": "Dr. Budi", "Tipe": "Reguler", "Sesi": str(i + 1),
+                          "Req Zoom": f"Basis Data_Pertemuan {i + 1}", "Nama File Foto": f"foto_{i + 1}.png"} for i in range(n)])
+
+FIRST = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hendra", "Intan", "Muhammad", "Nur", "Rina", "Sri", "Yusuf"]
+MIDDLE = ["", "Adi", "Dwi", "Eka", "Indah", "Nur", "Putra", "Surya"]
+LAST = ["Saputra", "Santoso", "Lestari", "Hakim", "Siregar", "Nasution", "Wibowo", "Kurniawan", "Pratama", "Sari"]
+
+def person(rng):
+    return " ".join(p for p in (rng.choice(FIRST), rng.choice(MIDDLE), rng.choice(LAST)) if p)
+
+def noisy(name, rng):
+    # Variasi nama di Zoom/feedback: huruf kecil/besar, potong, typo, panggilan, teks acak
+    r = rng.random()
+    if r < 0.15: return name
+    if r < 0.3: return name.lower()
+    if r < 0.45: return name.upper()
+    if r < 0.6: return " ".join(name.split()[:2])
+    if r < 0.75:
+        chars = list(name); chars[rng.randrange(len(chars))] = rng.choice("aiueoxz")
+        return "".join(chars)
+    if r < 0.85: return name.split()[0][:rng.randint(1, 4)]
+    if r < 0.95: return person(rng)
+    return "".join(rng.choice("abcdefghijklmnop ") for _ in range(rng.randint(0, 12)))
+
+class SlowReader(FakeReader):
+    # Reader palsu yang lambat dan menghitung panggilan readtext (untuk tes pembatalan)
+    def __init__(self, delay=0.05):
+        self.delay = delay; self.calls = 0; self.lock = threading.Lock()
+
+    def readtext(self, arr, detail=0):
+        with self.lock: self.calls += 1
+        time.sleep(self.delay)
+        return super().readtext(arr, detail)
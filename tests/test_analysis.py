@@ -0,0 +1,152 @@
+import pickle
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from fasil_engine.analysis import (FeedbackIndex, generate_presensi_real, presensi_matrix, presensi_roster, presensi_sheets,
+                                   run_analysis)
+from fasil_engine.matching import RosterIndex, clean_nama_zoom
+from fasil_engine.parsing import get_session_list
+from tests.conftest import noisy, person
+
+def run_analysis_reference(info, txt_zoom, txt_onsite, db_names, df_fb):
+    # Salinan run_analysis sebelum FeedbackIndex (iterrows + match per baris feedback, per kelas)
+    roster = RosterIndex(db_names)
+    hadir_zoom = set()
+    for z in [clean_nama_zoom(x) for x in str(txt_zoom).split('\n') if len(x)>3]:
+        best, _ = roster.match(z)
+        if best: hadir_zoom.add(best)
+    hadir_onsite = set()
+    for z in [clean_nama_zoom(x) for x in str(txt_onsite).split('\n') if len(x)>3]:
+        best, _ = roster.match(z)
+        if best: hadir_onsite.add(best)
+    total_hadir = hadir_zoom.union(hadir_onsite)
+
+    final_fb = set()
+    ghosts = []
+    if df_fb is not None:
+        col_fb = next((c for c in df_fb.columns if 'nama' in str(c).lower()), None)
+        col_sesi = next((c for c in df_fb.columns if 'pertemuan' in str(c).lower() or 'sesi' in str(c).lower()), None)
+        targets = [str(s) for s in get_session_list(info['pertemuan'])]
+        if col_fb:
+            for _, r in df_fb.iterrows():
+                valid = True
+                if col_sesi:
+                    csv_val = re.findall(r'\d+', str(r[col_sesi]))
+                    if not set(targets).intersection(set(csv_val)): valid = False
+                if valid:
+                    m, _ = roster.match(str(r[col_fb]))
+                    if m:
+                        final_fb.add(m)
+                        if m not in total_hadir: ghosts.append(m)
+
+    fb_ok = 0; fb_no = []
+    for h in total_hadir:
+        if h in final_fb: fb_ok += 1
+        else: fb_no.append(h)
+    stats = {'total': len(roster), 'hadir_valid': len(total_hadir), 'online_count': len(hadir_zoom),
+             'onsite_count': len(hadir_onsite), 'fb_ok': fb_ok, 'fb_no': len(fb_no),
+             'pct': round(fb_ok/len(total_hadir)*100,1) if total_hadir else 0, 'ghosts': ghosts, 'fb_no_list': fb_no}
+    return stats, hadir_zoom, hadir_onsite, final_fb
+
+PERTEMUAN = ["1", "2", "3", "1-2", "2 & 3", "Pertemuan 4", "5 dan 6", "16", "15"]  # sesi 15: tidak ada baris feedback
+
+def feedback_frame(rng, roster, n, with_sesi=True):
+    data = {"Nama Lengkap": [noisy(rng.choice(roster), rng) if rng.random() < 0.9 else person(rng) for _ in range(n)]}
+    if with_sesi: data["Pertemuan Ke"] = [rng.choice(["1", "2", "3", "1, 2", "Pertemuan 4", "5", "6", "16", "", "x"]) for _ in range(n)]
+    return pd.DataFrame(data)
+
+def attendance(rng, roster, n):
+    lines = [noisy(rng.choice(roster), rng) for _ in range(n)] + ["Host Fasil", "ab", "Admin Kelas"]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+def assert_analysis_parity(info, txt_zoom, txt_onsite, roster, df_fb, fb_index):
+    stats, zoom, onsite, fb = run_analysis(info, txt_zoom, txt_onsite, roster, fb_index)
+    ref_stats, ref_zoom, ref_onsite, ref_fb = run_analysis_reference(info, txt_zoom, txt_onsite, roster.names, df_fb)
+    assert (zoom, onsite, fb) == (ref_zoom, ref_onsite, ref_fb)
+    assert sorted(stats.pop('fb_no_list')) == sorted(ref_stats.pop('fb_no_list'))
+    assert stats == ref_stats  # termasuk urutan & duplikat ghosts
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("with_sesi", [True, False])
+def test_feedback_index_matches_reference(seed, with_sesi):
+    rng = random.Random(seed)
+    roster = RosterIndex([person(rng) for _ in range(40)])
+    df_fb = feedback_frame(rng, roster.names, 80, with_sesi)
+    fb_index = FeedbackIndex(df_fb, roster)  # satu index dipakai semua kelas, seperti run_batch
+    for pertemuan in PERTEMUAN:
+        info = {"pertemuan": pertemuan}
+        txt_zoom, txt_onsite = attendance(rng, roster.names, 15), attendance(rng, roster.names, 5)
+        assert_analysis_parity(info, txt_zoom, txt_onsite, roster, df_fb, fb_index)
+        assert_analysis_parity(info, txt_zoom, txt_onsite, roster, df_fb, df_fb)  # DataFrame langsung
+
+def test_session_without_feedback_rows():
+    rng = random.Random(7)
+    roster = RosterIndex([person(rng) for _ in range(10)])
+    df_fb = pd.DataFrame({"Nama": roster.names[:5], "Sesi": ["1"] * 5})
+    txt_zoom = "\n".join(roster.names[:4])
+    stats, _, _, fb = run_analysis({"pertemuan": "9"}, txt_zoom, "", roster, FeedbackIndex(df_fb, roster))
+    assert fb == set() and stats['ghosts'] == [] and stats['fb_ok'] == 0 and stats['pct'] == 0.0
+    assert_analysis_parity({"pertemuan": "9"}, txt_zoom, "", roster, df_fb, FeedbackIndex(df_fb, roster))
+
+def test_without_feedback_sheet():
+    roster = RosterIndex(["Andi Saputra", "Budi Santoso"])
+    assert_analysis_parity({"pertemuan": "1"}, "Andi Saputra\nBudi", "", roster, None, None)
+    assert_analysis_parity({"pertemuan": "1"}, "Andi Saputra", "", roster, pd.DataFrame({"Komentar": ["ok"]}),
+                           FeedbackIndex(pd.DataFrame({"Komentar": ["ok"]}), roster))
+
+# --- Presensi: PresensiMatrix vs generate_presensi_real lama ---
+def generate_presensi_reference(db, hadir_zoom, hadir_onsite, list_feedback, info):
+    # Salinan generate_presensi_real sebelum PresensiMatrix (iterrows + df.loc per sel)
+    df = db.copy()
+    col_nm = next((c for c in df.columns if 'nama' in str(c).lower()), df.columns[1])
+    col_nim = next((c for c in df.columns if 'nim' in str(c).lower()), df.columns[0])
+    df_out = df[[col_nim, col_nm]].copy()
+    df_out.columns = ['NIM', 'Nama Mahasiswa']
+    target_sessions = get_session_list(info['pertemuan'])
+    for idx, r in df_out.iterrows():
+        n = str(r['Nama Mahasiswa'])
+        code = "A"
+        if n in hadir_onsite: code = "S" if n in list_feedback else "SF"
+        elif n in hadir_zoom: code = "O" if n in list_feedback else "OF"
+        for s in target_sessions:
+            if 1 <= int(s) <= 16: df_out.loc[idx, f"Sesi {s}"] = code
+    return df_out
+
+def assert_presensi_parity(db, hadir_zoom, hadir_onsite, list_feedback, info):
+    got = generate_presensi_real(db, hadir_zoom, hadir_onsite, list_feedback, info)
+    ref = generate_presensi_reference(db, hadir_zoom, hadir_onsite, list_feedback, info)
+    pd.testing.assert_frame_equal(got, ref, check_dtype=False)
+    # Jalur batch: matriks per kelas (lewat pickle RowCache) lalu sheet dibuat saat export
+    base = presensi_roster(db)
+    m = pickle.loads(pickle.dumps(presensi_matrix(base['Nama Mahasiswa'].astype(str), hadir_zoom, hadir_onsite, list_feedback, info)))
+    pd.testing.assert_frame_equal(next(presensi_sheets({"1_X": m}, base))[1], ref, check_dtype=False)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_presensi_matches_reference(seed):
+    rng = random.Random(seed)
+    names = [person(rng) for _ in range(30)]
+    db = pd.DataFrame({"NIM": [f"22{i:04d}" for i in range(30)], "Nama": names})
+    outsiders = [person(rng) + " Luar" for _ in range(5)]  # nama yang tidak ada di roster
+    pick = lambda k: set(rng.sample(names, k)) | set(rng.sample(outsiders, 2))
+    hadir_zoom, hadir_onsite, fb = pick(12), pick(8), pick(15)
+    for pertemuan in PERTEMUAN + ["0", "17", "3-3", "x", "14-16"]:
+        assert_presensi_parity(db, hadir_zoom, hadir_onsite, fb, {"pertemuan": pertemuan})
+
+def test_presensi_codes_per_student_kind():
+    db = pd.DataFrame({"NIM": ["1", "2", "3", "4", "5", "6", "7"],
+                       "Nama Mahasiswa": ["Zoom Fb", "Zoom Saja", "Offline Fb", "Offline Saja", "Dua Duanya", "Fb Saja", "Absen"]})
+    hadir_zoom = {"Zoom Fb", "Zoom Saja", "Dua Duanya", "Tidak Terdaftar"}
+    hadir_onsite = {"Offline Fb", "Offline Saja", "Dua Duanya"}
+    fb = {"Zoom Fb", "Offline Fb", "Dua Duanya", "Fb Saja", "Hantu"}
+    got = generate_presensi_real(db, hadir_zoom, hadir_onsite, fb, {"pertemuan": "2-3"})
+    assert got["Sesi 2"].tolist() == ["O", "OF", "S", "SF", "S", "A", "A"] and got["Sesi 3"].tolist() == got["Sesi 2"].tolist()
+    assert_presensi_parity(db, hadir_zoom, hadir_onsite, fb, {"pertemuan": "2-3"})
+
+def test_presensi_empty_roster_and_no_sessions():
+    empty = pd.DataFrame({"NIM": pd.Series([], dtype=object), "Nama": pd.Series([], dtype=object)})
+    assert_presensi_parity(empty, {"A"}, set(), set(), {"pertemuan": "1"})
+    assert_presensi_parity(pd.DataFrame({"NIM": ["1"], "Nama": ["Andi"]}), {"Andi"}, set(), set(), {"pertemuan": "Pertemuan"})
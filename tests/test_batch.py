@@ -0,0 +1,48 @@
+import pandas as pd
+
+from fasil_engine import batch, ocr
+from fasil_engine.matching import RosterIndex
+from tests.conftest import NAMES, FakeReader, batch_frame, broken_reader, photo
+
+def test_failed_ocr_is_not_row_cached(fresh_caches, monkeypatch):
+    db = pd.DataFrame({"NIM": ["1", "2", "3"], "Nama": NAMES})
+    df_proc = batch_frame(3)
+    images = {f"foto_{i + 1}.png": photo(10 * i) for i in range(3)}
+
+    monkeypatch.setattr(ocr, "get_ocr_reader", broken_reader)
+    failed = batch.run_batch(df_proc, db, images=images, ocr_workers=2)["report"].rows
+    assert [r["ocr_source"] for r in failed] == ["error"] * 3
+    assert [r["hadir_zoom"] for r in failed] == [0] * 3
+
+    monkeypatch.setattr(ocr, "get_ocr_reader", FakeReader)
+    retried = batch.run_batch(df_proc, db, images=images, ocr_workers=2)["report"].rows
+    assert [r["ocr_source"] for r in retried] == ["ocr"] * 3
+    assert [r["hadir_zoom"] for r in retried] == [3] * 3
+
+    cached = batch.run_batch(df_proc, db, images=images, ocr_workers=2)["report"].rows
+    assert [r["ocr_source"] for r in cached] == ["row-cache"] * 3
+
+class BusyRoster(RosterIndex):
+    # Roster yang dipakai bersama: tiap match dari batch ini diselingi match milik "job lain"
+    def match(self, nama_zoom, counter=None):
+        super().match("Mahasiswa Job Lain")
+        return super().match(nama_zoom, counter)
+
+def test_match_counters_are_per_row_and_fingerprint_is_one_pass(fresh_caches, monkeypatch):
+    monkeypatch.setattr(ocr, "get_ocr_reader", FakeReader)
+    db = pd.DataFrame({"NIM": ["1", "2", "3"], "Nama": NAMES})
+    images = {f"foto_{i + 1}.png": photo(10 * i) for i in range(4)}
+    report = batch.run_batch(batch_frame(4), db, images=images, ocr_workers=1, use_cache=False, roster=BusyRoster(NAMES))["report"]
+    assert [r["match_calls"] for r in report.rows] == [3] * 4
+    assert [r["match_cache_hits"] for r in report.rows] == [0, 3, 3, 3]
+    assert report.counters["match_calls"] == 12 and report.counters["match_cache_hits"] == 9
+    assert report.stages["fingerprint"]["calls"] == 1 and report.stages["fingerprint"]["rows"] == 4
+
+def test_row_cache_key_includes_format_version(fresh_caches, monkeypatch):
+    monkeypatch.setattr(ocr, "get_ocr_reader", FakeReader)
+    db = pd.DataFrame({"NIM": ["1", "2", "3"], "Nama": NAMES})
+    images = {"foto_1.png": photo(0), "foto_2.png": photo(10)}
+    batch.run_batch(batch_frame(2), db, images=images, ocr_workers=1)
+    assert [r["cached"] for r in batch.run_batch(batch_frame(2), db, images=images, ocr_workers=1)["report"].rows] == [True] * 2
+    monkeypatch.setattr(batch, "ROW_CACHE_VERSION", batch.ROW_CACHE_VERSION + 1)
+    assert [r["cached"] for r in batch.run_batch(batch_frame(2), db, images=images, ocr_workers=1)["report"].rows] == [False] * 2
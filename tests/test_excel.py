@@ -0,0 +1,40 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from fasil_engine import excel
+
+@pytest.fixture(autouse=True)
+def fresh_table_cache(monkeypatch):
+    monkeypatch.setattr(excel, "_table_cache", excel.TableCache())
+
+def upload(data, name):
+    f = BytesIO(data); f.name = name
+    return f
+
+FEEDBACK = pd.DataFrame({"Timestamp": ["2024-02-12 10:00", "2024-02-12 10:05"], "Nama Lengkap": ["Andi Saputra", "budi santoso"],
+                         "Pertemuan Ke": ["Pertemuan 1", "1"], "Saran": ["materi jelas", "zoom lag"]})
+
+@pytest.mark.parametrize("sep", [";", ",", "\t"])
+def test_load_feedback_csv_keeps_name_and_session_columns(sep):
+    df = excel.load_feedback(upload(FEEDBACK.to_csv(index=False, sep=sep).encode(), "feedback.csv"))
+    assert list(df.columns) == ["Nama Lengkap", "Pertemuan Ke"]
+    assert df.astype(str).values.tolist() == FEEDBACK[["Nama Lengkap", "Pertemuan Ke"]].values.tolist()
+
+def test_load_feedback_excel_matches_read_excel():
+    buf = BytesIO(); FEEDBACK.to_excel(buf, index=False)
+    df = excel.load_feedback(upload(buf.getvalue(), "feedback.xlsx"))
+    expected = pd.read_excel(BytesIO(buf.getvalue()), usecols=["Nama Lengkap", "Pertemuan Ke"])
+    assert df.astype(str).equals(expected.astype(str))
+
+def test_load_table_returns_copies_from_cache():
+    data = FEEDBACK.to_csv(index=False).encode()
+    first = excel.load_data_smart(upload(data, "master.csv"))
+    first["Saran"] = "diubah"
+    second = excel.load_data_smart(upload(data, "master.csv"))
+    assert list(second["Saran"]) == ["materi jelas", "zoom lag"]
+    assert excel.get_table_cache().stats()["hits"] == 1
+
+def test_load_table_unreadable_file():
+    assert excel.load_data_smart(upload(b"\x00\x01 bukan excel", "rusak.xlsx")) is None
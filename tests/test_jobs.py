@@ -0,0 +1,53 @@
+import os
+import time
+import zipfile
+
+import pandas as pd
+
+from fasil_engine import ocr
+from fasil_engine.jobs import JobRunner, run_batch_job
+from tests.conftest import NAMES, FakeReader, SlowReader, batch_frame, photo
+
+def test_job_keeps_outputs_on_disk_and_removes_them_from_history(fresh_caches, monkeypatch):
+    monkeypatch.setattr(ocr, "get_ocr_reader", FakeReader)
+    db = pd.DataFrame({"NIM": ["1", "2", "3"], "Nama": NAMES})
+    images = {f"foto_{i + 1}.png": photo(10 * i) for i in range(3)}
+    runner = JobRunner(max_workers=1, keep=1)
+    job = runner.submit(run_batch_job, batch_frame(3), db, None, images, ocr_workers=1)
+    job.future.result()
+    assert job.status == "done", job.traceback
+    res = job.result
+    assert "photos" not in res and res["photo_count"] == 3 and res["missing_photos"] == []
+    with zipfile.ZipFile(res["photo_zip"]) as zf:
+        assert sorted(zf.namelist()) == ["foto_1.png", "foto_2.png", "foto_3.png"]
+        assert zf.read("foto_2.png") == images["foto_2.png"]
+    files = res["files"]
+    assert sorted(files) == ["Batch_Gaji.xlsx", "Batch_Laporan.xlsx", "Batch_Presensi.xlsx"]
+    assert all(os.path.exists(p) and p in job.temp_files for p in files.values())
+    assert len(pd.read_excel(files["Batch_Laporan.xlsx"])) == 3
+
+    # Riwayat penuh -> job lama dibuang beserta file ZIP-nya
+    runner.submit(run_batch_job, batch_frame(1), db, ocr_workers=1).future.result()
+    assert runner.get(job.id) is None and not os.path.exists(res["photo_zip"])
+    assert not any(os.path.exists(p) for p in files.values())
+
+def test_job_without_photos_has_no_zip(fresh_caches):
+    db = pd.DataFrame({"NIM": ["1"], "Nama": NAMES[:1]})
+    job = JobRunner(max_workers=1).submit(run_batch_job, batch_frame(2), db)
+    job.future.result()
+    assert job.status == "done", job.traceback
+    assert job.result["photo_zip"] is None and job.result["photo_count"] == 0
+    assert job.result["missing_photos"] == ["foto_1.png", "foto_2.png"]
+
+def test_cancel_stops_queued_ocr(fresh_caches, monkeypatch):
+    reader = SlowReader(0.1)
+    monkeypatch.setattr(ocr, "get_ocr_reader", lambda: reader)
+    db = pd.DataFrame({"NIM": ["1", "2", "3"], "Nama": NAMES})
+    images = {f"foto_{i + 1}.png": photo(i) for i in range(12)}
+    job = JobRunner(max_workers=1).submit(run_batch_job, batch_frame(12), db, None, images, ocr_workers=2)
+    while job.progress.get("ocr", (0,))[0] < 2: time.sleep(0.01)
+    job.cancel(); t0 = time.perf_counter()
+    job.future.result()
+    assert job.status == "cancelled" and time.perf_counter() - t0 < 0.5
+    time.sleep(0.25)
+    assert reader.calls <= 6
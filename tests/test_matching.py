@@ -0,0 +1,115 @@
+import difflib
+import random
+
+import pandas as pd
+import pytest
+
+from fasil_engine.matching import SCHEDULE_KEYS, RosterIndex, enrich_with_db, get_best_match_info, normalize_jam
+from tests.conftest import noisy, person
+
+def assert_parity(names, queries):
+    index = RosterIndex(names)
+    for q in queries:
+        assert index.match(q) == get_best_match_info(q, names), q
+        assert index.match(q) == get_best_match_info(q, names), q  # jalur cache
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_rosters_match_reference(seed):
+    rng = random.Random(seed)
+    names = [person(rng) for _ in range(rng.choice([1, 5, 40, 150]))]
+    assert_parity(names, [noisy(rng.choice(names), rng) for _ in range(300)])
+
+def test_empty_and_short_queries():
+    names = ["Andi Saputra", "Budi Santoso", "Sri Sari", "Eko"]
+    assert_parity(names, ["", " ", "a", "an", "ko", "eko", "Sr", "x", "zz", "ri"])
+
+def test_duplicate_and_case_colliding_names():
+    names = ["Andi Saputra", "andi saputra", "ANDI SAPUTRA", "Budi Santoso", "Budi Santoso", "Andi"]
+    assert_parity(names, ["andi", "Andi Saputra", "andi saputra x", "budi", "BUDI SANTOSO", "santos", "Andi Saputr"])
+
+def test_substring_conflicts():
+    names = ["Sari", "Sari Dewi", "Dewi Sari", "Nur", "Nur Hakim", "Muhammad Nur", "Ari", "Putri Sari Lestari"]
+    assert_parity(names, ["sari", "ari", "nur", "nur hakim", "Muhammad Nur Hakim", "dewi", "Putri Sari Lestari Wibowo",
+                          "i", "ri le", "Hakim Nur"])
+
+def test_difflib_fallback():
+    names = ["Andi Saputra", "Andy Saputro", "Budi Santoso", "Budhi Santosa", "Citra Lestari"]
+    assert_parity(names, ["Andi Saputre", "Andy Saputra", "Budi Santosi", "Cytra Lestary", "Bude Santasa", "Zzzz Qqqq"])
+
+def test_empty_roster():
+    assert_parity([], ["", "andi", "Budi Santoso"])
+
+# --- DB Jadwal: ScheduleIndex vs loop enrich_with_db lama ---
+def enrich_reference(df_batch, df_db):
+    # Salinan enrich_with_db sebelum ScheduleIndex (loop penuh SequenceMatcher per record)
+    col_mtk_db = next((c for c in df_db.columns if any(k in c.lower() for k in SCHEDULE_KEYS['mtk'])), None)
+    col_dos_db = next((c for c in df_db.columns if any(k in c.lower() for k in SCHEDULE_KEYS['dos'])), None)
+    col_jam_db = next((c for c in df_db.columns if any(k in c.lower() for k in SCHEDULE_KEYS['jam'])), None)
+    col_kod_db = next((c for c in df_db.columns if any(k in c.lower() for k in SCHEDULE_KEYS['kod'])), None)
+    if not col_mtk_db or not col_kod_db: return df_batch
+    db_records = df_db.to_dict('records')
+
+    def get_kode_smart(row):
+        if row['Kode Kelas'] not in ["N/A", ""]: return row['Kode Kelas']
+        tgt_mtk = str(row['Mata Kuliah']).lower().strip()
+        tgt_dos = str(row['Nama Dosen']).lower().strip()
+        tgt_jam = normalize_jam(row['Jam'])
+        best_score = 0; best_kode = "N/A"
+        for record in db_records:
+            db_mtk = str(record.get(col_mtk_db, '')).lower().strip()
+            db_dos = str(record.get(col_dos_db, '')).lower().strip() if col_dos_db else ""
+            db_jam = normalize_jam(record.get(col_jam_db, '')) if col_jam_db else ""
+            score_mtk = difflib.SequenceMatcher(None, tgt_mtk, db_mtk).ratio()
+            score_dos = 0
+            if col_dos_db:
+                score_dos = difflib.SequenceMatcher(None, tgt_dos, db_dos).ratio()
+                if tgt_dos in db_dos or db_dos in tgt_dos: score_dos = 1.0
+            score_jam = 1.0 if col_jam_db and tgt_jam and db_jam and tgt_jam == db_jam else 0.0
+            if col_dos_db and col_jam_db: final_score = (score_mtk * 0.4) + (score_dos * 0.3) + (score_jam * 0.3)
+            elif col_dos_db: final_score = (score_mtk * 0.6) + (score_dos * 0.4)
+            else: final_score = score_mtk
+            if final_score > best_score and final_score > 0.65:
+                best_score = final_score
+                best_kode = record[col_kod_db]
+        return best_kode
+
+    df_batch['Kode Kelas'] = df_batch.apply(get_kode_smart, axis=1)
+    return df_batch
+
+MATKUL = ["Algoritma", "Basis Data", "Jaringan Komputer", "Kalkulus", "Statistika", "Sistem Operasi", "Pemrograman Web"]
+JAM = ["08:00", "8.00", "10:00", "13.30", "13:30", "15:00", "", "pagi"]
+
+def schedule_frame(rng, n, columns=("Mata Kuliah", "Nama Dosen", "Jam", "Kode Kelas")):
+    data = {"Mata Kuliah": [rng.choice(MATKUL + [""]) for _ in range(n)], "Nama Dosen": [person(rng) for _ in range(n)],
+            "Jam": [rng.choice(JAM) for _ in range(n)], "Kode Kelas": [f"K{i + 1}" for i in range(n)]}
+    return pd.DataFrame({c: data[c] for c in columns})
+
+def batch_rows(rng, db, n):
+    src = db.to_dict('records')
+    rows = []
+    for _ in range(n):
+        r = rng.choice(src) if src else {}
+        rows.append({"Mata Kuliah": noisy(r["Mata Kuliah"], rng) if r.get("Mata Kuliah") and rng.random() < 0.8 else rng.choice(MATKUL + [""]),
+                     "Nama Dosen": noisy(r["Nama Dosen"], rng) if r.get("Nama Dosen") and rng.random() < 0.8 else person(rng),
+                     "Jam": rng.choice(JAM), "Kode Kelas": rng.choice(["N/A", "N/A", "N/A", "", "KX"])})
+    return pd.DataFrame(rows)
+
+def assert_enrich_parity(batch, db):
+    got = enrich_with_db(batch.copy(), db)["Kode Kelas"].tolist()
+    assert got == enrich_reference(batch.copy(), db)["Kode Kelas"].tolist()
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("columns", [("Mata Kuliah", "Nama Dosen", "Jam", "Kode Kelas"), ("Mata Kuliah", "Nama Dosen", "Kode Kelas"),
+                                     ("Mata Kuliah", "Kode Kelas")])
+def test_schedule_index_matches_reference(seed, columns):
+    rng = random.Random(seed)
+    db = schedule_frame(rng, rng.choice([1, 10, 60]), columns)
+    assert_enrich_parity(batch_rows(rng, db, 80), db)
+
+def test_empty_mata_kuliah_matches_empty_schedule_row():
+    # '' vs '' -> ratio 1.0, jadi baris jadwal dengan matkul kosong tetap kandidat
+    db = pd.DataFrame({"Mata Kuliah": ["", "Kalkulus"], "Kode Kelas": ["K1", "K2"]})
+    batch = pd.DataFrame({"Mata Kuliah": ["", "kalkulus", "zzz"], "Nama Dosen": ["", "", ""], "Jam": ["", "", ""],
+                          "Kode Kelas": ["N/A", "", "N/A"]})
+    assert enrich_with_db(batch.copy(), db)["Kode Kelas"].tolist() == ["K1", "K2", "N/A"]
+    assert_enrich_parity(batch, db)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from fasil_engine import ocr
+from fasil_engine.ocr import ocr_layout, select_name_rows
+from tests.conftest import SlowReader, photo
+
+PITCH, H, X = 40, 20, 100
+NAMES = ["Andi Saputra", "Budi Santoso", "Citra Dewi", "Dewi Lestari", "Eko Prasetyo"]
+
+def screen():
+    # (kotak x0, x1, y0, y1) -> teks: judul panel, kolom nama, tombol "Mute" di kanan, toolbar jauh di bawah
+    boxes = {(X, X + 160, 20, 20 + H): "Participants (6)"}
+    for i, name in enumerate(NAMES):
+        y = 100 + i * PITCH
+        boxes[(X, X + 150, y, y + H)] = name
+        boxes[(X + 400, X + 450, y, y + H)] = "Mute"
+    boxes[(X, X + 90, 100 + 5 * PITCH, 100 + 5 * PITCH + H)] = "Fitri Ayu"          # nama panjang yang turun
+    boxes[(X, X + 80, 100 + 5 * PITCH + H + 2, 100 + 5 * PITCH + 2 * H + 2)] = "Rahmawati"  # ke baris berikut
+    boxes[(-4, 60, 900, 900 + H)] = "Stop Video"
+    boxes[(X + 2, X + 8, 150, 154)] = "."  # terlalu kecil
+    return boxes
+
+class ShuffledReader:
+    # Seperti easyocr: detect -> ([kotak], [poligon]); recognize mengembalikan ([4 titik], teks, skor),
+    # di sini sengaja urut dari bawah ke atas (seperti jalur batched yang mengurutkan crop)
+    def __init__(self, boxes):
+        self.boxes = boxes; self.recognized = []
+
+    def detect(self, arr):
+        return [[list(b) for b in self.boxes]], [[]]
+
+    def recognize(self, arr, horizontal_list=None, free_list=None, detail=1):
+        self.recognized = [tuple(b) for b in horizontal_list]
+        text = {(max(0, b[0]), b[2]): t for b, t in self.boxes.items()}
+        out = [([[b[0], b[2]], [b[1], b[2]], [b[1], b[3]], [b[0], b[3]]], text[(b[0], b[2])], 0.9) for b in horizontal_list]
+        return sorted(out, key=lambda r: -r[0][0][1])
+
+def test_select_name_rows_keeps_name_column_only():
+    rows = select_name_rows(list(screen()))
+    texts = [[screen()[b] for b in row] for row in rows]
+    assert texts == [["Participants (6)"]] + [[n] for n in NAMES] + [["Fitri Ayu", "Rahmawati"]]
+
+def test_ocr_layout_maps_texts_by_box_not_by_order():
+    reader = ShuffledReader(screen())
+    text = ocr_layout(np.zeros((1000, 800), dtype=np.uint8), reader)
+    assert text.split("\n") == NAMES + ["Fitri Ayu Rahmawati"]
+    assert len(reader.recognized) == 8 and all(screen()[b] != "Mute" for b in reader.recognized)
+
+def test_ocr_layout_nothing_detected():
+    assert ocr_layout(np.zeros((100, 100), dtype=np.uint8), ShuffledReader({})) == ""
+    assert select_name_rows([]) == []
+
+class Cancelled(Exception):
+    pass
+
+def test_extract_texts_parallel_stops_queued_work_on_cancel(fresh_caches, monkeypatch):
+    reader = SlowReader(0.05)
+    monkeypatch.setattr(ocr, "get_ocr_reader", lambda: reader)
+    cancel = threading.Event()
+    def on_progress(done, total, name):
+        if done >= 2: cancel.set(); raise Cancelled()
+    t0 = time.perf_counter()
+    with pytest.raises(Cancelled):
+        ocr.extract_texts_parallel({f"f{i}.png": photo(i) for i in range(12)}, 2, on_progress, cancel=cancel)
+    assert time.perf_counter() - t0 < 0.4
+    time.sleep(0.15)  # worker yang sedang jalan saat dibatalkan boleh selesai, sisanya tidak
+    assert reader.calls <= 4
+
+def test_extract_texts_parallel_batched_skips_recognition_when_cancelled(fresh_caches, monkeypatch):
+    reader = SlowReader(0.0)
+    reader.readtext_batched = lambda *a, **k: pytest.fail("readtext_batched setelah dibatalkan")
+    monkeypatch.setattr(ocr, "get_ocr_reader", lambda: reader)
+    cancel = threading.Event(); cancel.set(); timings = {}
+    texts = ocr.extract_texts_parallel({f"f{i}.png": photo(i) for i in range(4)}, 2, batched=True, timings=timings, cancel=cancel)
+    assert texts == {f"f{i}.png": "" for i in range(4)} and reader.calls == 0
+    assert {s for _, s in timings.values()} == {"cancelled"}
@@ -0,0 +1,103 @@
+from io import BytesIO, StringIO
+
+import pytest
+
+from fasil_engine.parsing import iter_batch_entries, parse_random_batch_text
+
+# Paste jadwal -> (Sesi, Req Zoom, Nama File Foto) per baris, seperti keluaran parser lama
+# (sub \s*_\s* -> sub "(Part n)" -> split jam). Termasuk perilaku lama yang aneh (lihat "parts").
+GOLDEN = {
+    "simple": ("Andi Senin 2024 Basis Data Basis Data_Pertemuan 1 & 2_12 Feb 2024_Reguler_Dr. Budi_08.00 "
+               "Rina Selasa 2024 Kalkulus_Pertemuan 3_13 Feb 2024_Dewi Lestari_10.00", [
+        ("1", "Basis Data_Pertemuan 1 & 2_12 Feb 2024_Reguler_Dr. Budi_08:00", "12 Feb 2024_Dr. Budi_Basis Data_Andi_Pertemuan 1.jpg"),
+        ("2", "Basis Data_Pertemuan 1 & 2_12 Feb 2024_Reguler_Dr. Budi_08:00", "12 Feb 2024_Dr. Budi_Basis Data_Andi_Pertemuan 2.jpg"),
+        ("3", "Kalkulus_Pertemuan 3_13 Feb 2024_Reguler_Dewi Lestari_10:00", "13 Feb 2024_Dewi Lestari_Kalkulus_Rina_Pertemuan 3.jpg"),
+    ]),
+    "spaced": ("Sari\tRabu, 14 Feb 2024   Jaringan Komputer\tJaringan Komputer _ Pertemuan 4 _ 14 Feb, 2024 _ Profesional _ Ir. Jokó / Tim _ 13:30\n"
+               "Budi Kamis 2024 Sistem Operasi  _  Pertemuan 5-6  _ 15 Feb 2024 _ International _ Prof. Ani: PhD _ 9.15\n", [
+        ("4", "Jaringan Komputer_Pertemuan 4_14 Feb, 2024_Profesional_Ir. Jokó / Tim_13:30",
+         "14 Feb 2024_Ir. Jokó  Tim_Jaringan Komputer_Sari_Pertemuan 4.jpg"),
+        ("5", "Sistem Operasi_Pertemuan 5-6_15 Feb 2024_International_Prof. Ani: PhD_09:15",
+         "15 Feb 2024_Prof. Ani PhD_Sistem Operasi_Budi_Pertemuan 5.jpg"),
+        ("6", "Sistem Operasi_Pertemuan 5-6_15 Feb 2024_International_Prof. Ani: PhD_09:15",
+         "15 Feb 2024_Prof. Ani PhD_Sistem Operasi_Budi_Pertemuan 6.jpg"),
+    ]),
+    "parts": ("Eko Jumat 2024 Statistika_Pertemuan 7_16 Feb 2024_Reg_Dr. Sinta_08:00 (Part 1)\n"
+              "Eko Jumat 2024 Statistika_Pertemuan 7_16 Feb 2024_Reg_Dr. Sinta_10.00(part 2)\n"
+              "Eko Sabtu 2024 Statistika_Pertemuan 8_17 Feb 2024_Pro_Dr. Sinta_13.00  (PART   3)", [
+        ("1", "Statistika_Pertemuan 7_16 Feb 2024_Reg_Dr. Sinta_Reguler_Pertemuan 1_08:00",
+         "Dr. Sinta_Pertemuan 1_Statistika_Pertemuan 7_16 Feb 2024_Eko_Pertemuan 1.jpg"),
+        ("1", "Statistika_Pertemuan 7_16 Feb 2024_Reg_Dr. Sinta_Reguler_Pertemuan 2_10:00",
+         "Dr. Sinta_Pertemuan 2_Statistika_Pertemuan 7_16 Feb 2024_Eko_Pertemuan 1.jpg"),
+        ("1", "Statistika_Pertemuan 8_17 Feb 2024_Pro_Dr. Sinta_Reguler_Pertemuan 3_13:00",
+         "Dr. Sinta_Pertemuan 3_Statistika_Pertemuan 8_17 Feb 2024_Eko_Pertemuan 1.jpg"),
+    ]),
+    "messy": ("catatan awal tanpa jam\nFitri Minggu 2024 Pemrograman Web Pemrograman Web_Pertemuan 9 dan 10_18 Feb 2024_Dr. \"Rudi\"_19.00\n"
+              "x_1.00\nGilang 2024 Etika Profesi_Pertemuan_20 Feb 2024_Reguler_Dra. Mia_7.45", [
+        ("9", "Pemrograman Web_Pertemuan 9 dan 10_18 Feb 2024_Reguler_Dr. \"Rudi\"_19:00",
+         "18 Feb 2024_Dr. Rudi_Pemrograman Web_Fitri_Pertemuan 9.jpg"),
+        ("10", "Pemrograman Web_Pertemuan 9 dan 10_18 Feb 2024_Reguler_Dr. \"Rudi\"_19:00",
+         "18 Feb 2024_Dr. Rudi_Pemrograman Web_Fitri_Pertemuan 10.jpg"),
+        ("1", "Etika Profesi_Pertemuan_20 Feb 2024_Reguler_Dra. Mia_07:45", "20 Feb 2024_Dra. Mia_Etika Profesi_Fasil_Pertemuan 1.jpg"),
+    ]),
+}
+
+class TrickleBytes(BytesIO):
+    # Stream biner yang mengembalikan paling banyak `step` byte per read (memotong karakter UTF-8 multi-byte)
+    def __init__(self, data, step):
+        super().__init__(data); self.step = step
+
+    def read(self, size=-1):
+        return super().read(self.step if size < 0 else min(size, self.step))
+
+def rows(source):
+    return [tuple(r) for r in parse_random_batch_text(source)[["Sesi", "Req Zoom", "Nama File Foto"]].values.tolist()]
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+@pytest.mark.parametrize("name", GOLDEN)
+def test_golden_whole_string(name):
+    text, expected = GOLDEN[name]
+    assert rows(text) == expected
+
+@pytest.mark.parametrize("name", GOLDEN)
+def test_golden_every_two_chunk_cut(name):
+    # Setiap posisi potong: di tengah "_", "\s*_\s*", jam dan "(Part n)"
+    text, expected = GOLDEN[name]
+    for cut in range(1, len(text)):
+        assert rows([text[:cut], text[cut:]]) == expected, cut
+
+@pytest.mark.parametrize("name", GOLDEN)
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 13])
+def test_golden_small_chunks(name, size):
+    text, expected = GOLDEN[name]
+    assert rows(chunks(text, size)) == expected
+    assert rows(StringIO(text)) == expected
+
+@pytest.mark.parametrize("name", GOLDEN)
+@pytest.mark.parametrize("step", [1, 2, 3, 64])
+def test_golden_binary_stream(name, step):
+    text, expected = GOLDEN[name]
+    assert rows(TrickleBytes(text.encode("utf-8-sig"), step)) == expected
+    assert rows(text.encode("utf-8")) == expected
+
+def test_full_row_fields():
+    df = parse_random_batch_text(GOLDEN["simple"][0])
+    assert df[["Tanggal", "Fasilitator", "Jam", "Kode Kelas", "Mata Kuliah", "Nama Dosen", "Tipe"]].values.tolist() == [
+        ["12 Feb 2024", "Andi", "08:00", "N/A", "Basis Data", "Dr. Budi", "Reguler"],
+        ["12 Feb 2024", "Andi", "08:00", "N/A", "Basis Data", "Dr. Budi", "Reguler"],
+        ["13 Feb 2024", "Rina", "10:00", "N/A", "Kalkulus", "Dewi Lestari", "Reguler"],
+    ]
+
+def test_entries_are_yielded_before_the_stream_ends():
+    text = GOLDEN["simple"][0]
+    consumed = []
+    def source():
+        for c in chunks(text, 16): consumed.append(c); yield c
+    first = next(iter_batch_entries(source()))
+    assert first.endswith("_08.00") and len("".join(consumed)) < len(text)
+
+def test_empty_input():
+    assert parse_random_batch_text("").empty
+    assert parse_random_batch_text(BytesIO(b"")).empty
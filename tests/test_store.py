@@ -0,0 +1,51 @@
+import pandas as pd
+
+from fasil_engine.store import DataStore
+
+def master(*names):
+    return pd.DataFrame({"No": range(1, len(names) + 1), "Nim": [f"2201{i:04d}" for i in range(len(names))],
+                         "Nama Mahasiswa": list(names)})
+
+def feedback(*rows):
+    return pd.DataFrame(rows, columns=["Nama Lengkap", "Pertemuan Ke"])
+
+def test_reimport_same_content_keeps_id(tmp_path):
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    first = store.import_frame("master", master("Andi Saputra", "Budi Santoso"), "TI-1", "2024/1")
+    assert store.import_frame("master", master("Andi Saputra", "Budi Santoso"), "TI-1", "2024/1") == first
+
+def test_reimport_changed_master_replaces_frame_and_index(tmp_path):
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    old = store.import_frame("master", master("Andi Saputra", "Budi Santoso"), "TI-1", "2024/1")
+    assert store.roster_index(old).names == ["Andi Saputra", "Budi Santoso"]
+    new = store.import_frame("master", master("Andi Saputra", "Budi Santoso", "Citra Lestari"), "TI-1", "2024/1")
+    assert new != old and store.find("master", "TI-1", "2024/1") == new
+    assert len(store.frame(new)) == 3
+    assert store.roster_index(new).names == ["Andi Saputra", "Budi Santoso", "Citra Lestari"]
+    assert store.roster_index(new).match("citra lestari")[0] == "Citra Lestari"
+
+def test_reimport_changed_feedback_rebuilds_feedback_index(tmp_path):
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    master_id = store.import_frame("master", master("Andi Saputra", "Budi Santoso"), "TI-1", "2024/1")
+    week1 = store.import_frame("feedback", feedback(("Andi Saputra", "Pertemuan 1")), "TI-1", "2024/1")
+    assert store.feedback_index(week1, master_id).lookup("1", set())[0] == {"Andi Saputra"}
+    week2 = store.import_frame("feedback", feedback(("Andi Saputra", "Pertemuan 1"), ("budi santoso", "Pertemuan 1")), "TI-1", "2024/1")
+    assert len(store.frame(week2)) == 2
+    assert store.feedback_index(week2, master_id).lookup("1", set())[0] == {"Andi Saputra", "Budi Santoso"}
+
+def test_reimport_changed_master_drops_feedback_index_built_on_it(tmp_path):
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    old = store.import_frame("master", master("Andi Saputra"), "TI-1", "2024/1")
+    fb = store.import_frame("feedback", feedback(("Citra Lestari", "Pertemuan 1")), "TI-1", "2024/1")
+    assert store.feedback_index(fb, old).lookup("1", set())[0] != {"Citra Lestari"}
+    new = store.import_frame("master", master("Andi Saputra", "Citra Lestari"), "TI-1", "2024/1")
+    assert store.feedback_index(fb, new).lookup("1", set())[0] == {"Citra Lestari"}
+
+def test_delete_then_import_does_not_reuse_id(tmp_path):
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    old = store.import_frame("master", master("Andi Saputra"), "TI-1", "2024/1")
+    store.roster_index(old)
+    store.delete(old)
+    new = store.import_frame("master", master("Budi Santoso"), "TI-1", "2024/1")
+    assert new != old
+    assert store.roster_index(new).names == ["Budi Santoso"]